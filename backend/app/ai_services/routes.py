@@ -4,10 +4,14 @@ API endpoints for AI-powered features: insights, Q&A, and onboarding.
 """
 
 from fastapi import APIRouter, HTTPException, status
-from typing import Dict, Any
+from fastapi.responses import StreamingResponse
+from typing import Dict, Any, AsyncIterator, Optional
 import logging
+import time
 
-from ..shared.ai_service import get_ai_service
+import orjson
+
+from ..shared.ai_service import AIService, get_ai_service, fallback_used
 from ..shared.ai_models import (
     InsightsRequest, InsightsResponse,
     QARequest, QAResponse,
@@ -17,10 +21,25 @@ from ..shared.ai_models import (
     AIErrorResponse
 )
 from ..shared.database import get_database
+from ..shared.db_helpers import fetch_profile, fetch_profile_with_debts
+from ..shared.response_cache import get_response_cache, make_key, is_cacheable_context
 
 router = APIRouter(prefix="/api/v1/ai", tags=["AI Services"])
 logger = logging.getLogger(__name__)
 
+# Debt fields rendered into AI prompts; everything else stays in MongoDB
+DEBT_AI_PROJECTION = {"_id": 0, "name": 1, "type": 1, "balance": 1, "apr": 1, "minimum_payment": 1}
+
+# Health probes hit /health every second or so; reuse the payload briefly
+HEALTH_CACHE_TTL_SECONDS = 5.0
+_health_cache: Dict[str, Any] = {"payload": None, "ts": 0.0}
+
+
+def sse_event(data: Dict[str, Any], event: Optional[str] = None) -> bytes:
+    """Encode one Server-Sent Event"""
+    prefix = f"event: {event}\n".encode() if event else b""
+    return prefix + b"data: " + orjson.dumps(data) + b"\n\n"
+
 
 @router.post("/insights", response_model=InsightsResponse)
 async def generate_insights(request: InsightsRequest):
@@ -66,16 +85,10 @@ async def generate_insights(request: InsightsRequest):
         # Get database
         db = await get_database()
         
-        # Fetch profile - try both ObjectId and user_id (for test profiles)
-        from bson import ObjectId
-        profile = None
-        
-        # First try as MongoDB ObjectId
-        try:
-            profile = await db.profiles.find_one({"_id": ObjectId(request.profile_id)})
-        except:
-            # If that fails, try as user_id (for test profiles like "test-profile-6")
-            profile = await db.profiles.find_one({"user_id": request.profile_id})
+        # Fetch profile (by ObjectId or user_id) and its debts in one round trip
+        profile, debts = await fetch_profile_with_debts(
+            db, request.profile_id, debt_projection=DEBT_AI_PROJECTION
+        )
         
         if not profile:
             raise HTTPException(
@@ -83,16 +96,19 @@ async def generate_insights(request: InsightsRequest):
                 detail=f"Profile not found: {request.profile_id}"
             )
         
-        # Fetch debts using the profile_id
-        debts_cursor = db.debts.find({"profile_id": request.profile_id})
-        debts = await debts_cursor.to_list(length=100)
-        
         if not debts:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="No debts found for this profile. Add debts first."
             )
         
+        # Serve a prior response for the same profile/debt picture
+        response_cache = get_response_cache()
+        cache_key = make_key("insights", profile, debts)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return InsightsResponse(response=cached)
+        
         # Get AI service
         ai_service = get_ai_service()
         
@@ -103,12 +119,15 @@ async def generate_insights(request: InsightsRequest):
             scenario_data=None
         )
         
+        if not fallback_used():
+            response_cache.put(cache_key, response.response.model_dump())
+        
         return response
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error generating insights: {e}")
+        logger.exception("Error generating insights: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to generate insights. Please try again."
@@ -159,16 +178,10 @@ async def ask_question(request: QARequest):
         # Get database
         db = await get_database()
         
-        # Fetch profile - try both ObjectId and user_id (for test profiles)
-        from bson import ObjectId
-        profile = None
-        
-        # First try as MongoDB ObjectId
-        try:
-            profile = await db.profiles.find_one({"_id": ObjectId(request.profile_id)})
-        except:
-            # If that fails, try as user_id (for test profiles like "test-profile-6")
-            profile = await db.profiles.find_one({"user_id": request.profile_id})
+        # Fetch profile (by ObjectId or user_id) and its debts in one round trip
+        profile, debts = await fetch_profile_with_debts(
+            db, request.profile_id, debt_projection=DEBT_AI_PROJECTION
+        )
         
         if not profile:
             raise HTTPException(
@@ -176,9 +189,14 @@ async def ask_question(request: QARequest):
                 detail=f"Profile not found: {request.profile_id}"
             )
         
-        # Fetch debts using the profile_id
-        debts_cursor = db.debts.find({"profile_id": request.profile_id})
-        debts = await debts_cursor.to_list(length=100)
+        # Serve a prior answer to the same or a near-identical question
+        response_cache = get_response_cache()
+        use_cache = is_cacheable_context(request.context)
+        if use_cache:
+            cache_key = make_key(request.question, profile, debts, request.context)
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                return QAResponse(response=cached)
         
         # Get AI service
         ai_service = get_ai_service()
@@ -191,21 +209,88 @@ async def ask_question(request: QARequest):
             context=request.context
         )
         
+        if use_cache and not fallback_used():
+            response_cache.put(cache_key, response.response.model_dump())
+        
         return response
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error answering question: {e}", exc_info=True)
-        # Log the full traceback for debugging
-        import traceback
-        logger.error(f"Full traceback: {traceback.format_exc()}")
+        logger.exception("Error answering question: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to answer question: {str(e)}"
         )
 
 
+@router.post("/ask/stream")
+async def ask_question_stream(request: QARequest):
+    """
+    Answer a question, streaming the answer as Server-Sent Events.
+    
+    The provider's output is read as it is generated, but only the parsed,
+    sanitized answer is sent: a single `event: response` whose data is the
+    complete QAResponse (the same body `/ask` returns). The raw stream is a
+    JSON document rather than answer text, and is never forwarded. If the
+    answer can't be generated, the event carries the fallback answer.
+    """
+    try:
+        db = await get_database()
+        profile, debts = await fetch_profile_with_debts(
+            db, request.profile_id, debt_projection=DEBT_AI_PROJECTION
+        )
+    except Exception as e:
+        logger.exception("Error loading profile for streamed answer: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to answer question: {str(e)}"
+        )
+    
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Profile not found: {request.profile_id}"
+        )
+    
+    response_cache = get_response_cache()
+    use_cache = is_cacheable_context(request.context)
+    cache_key = make_key(request.question, profile, debts, request.context) if use_cache else None
+    
+    async def events() -> AsyncIterator[bytes]:
+        if use_cache:
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                yield sse_event(QAResponse(response=cached).model_dump(mode="json"), event="response")
+                return
+        
+        try:
+            ai_service = get_ai_service()
+            chunks = [
+                delta async for delta in ai_service.answer_question_stream(
+                    question=request.question,
+                    profile_data=profile,
+                    debt_data=debts,
+                    context=request.context
+                )
+            ]
+            response = ai_service.parse_qa_response("".join(chunks))
+        except Exception as e:
+            logger.exception("Error streaming answer: %s", e)
+            yield sse_event(AIService.qa_fallback_response().model_dump(mode="json"), event="response")
+            return
+        
+        if use_cache:
+            response_cache.put(cache_key, response.response.model_dump())
+        yield sse_event(response.model_dump(mode="json"), event="response")
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.post("/compare-strategies", response_model=StrategyComparisonResponse)
 async def compare_strategies(request: StrategyComparisonRequest):
     """
@@ -239,15 +324,7 @@ async def compare_strategies(request: StrategyComparisonRequest):
         db = await get_database()
         
         # Fetch profile - try both ObjectId and user_id (for test profiles)
-        from bson import ObjectId
-        profile = None
-        
-        # First try as MongoDB ObjectId
-        try:
-            profile = await db.profiles.find_one({"_id": ObjectId(request.profile_id)})
-        except:
-            # If that fails, try as user_id (for test profiles like "test-profile-6")
-            profile = await db.profiles.find_one({"user_id": request.profile_id})
+        profile = await fetch_profile(db, request.profile_id)
         
         if not profile:
             raise HTTPException(
@@ -270,7 +347,7 @@ async def compare_strategies(request: StrategyComparisonRequest):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error comparing strategies: {e}")
+        logger.exception("Error comparing strategies: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to compare strategies. Please try again."
@@ -320,7 +397,7 @@ async def onboarding_conversation(request: OnboardingRequest):
         return response
         
     except Exception as e:
-        logger.error(f"Error in onboarding conversation: {e}")
+        logger.exception("Error in onboarding conversation: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to generate onboarding message. Please try again."
@@ -385,7 +462,7 @@ async def onboarding_reaction(request: OnboardingReactionRequest):
         )
         
     except Exception as e:
-        logger.error(f"Error generating onboarding reaction: {e}")
+        logger.exception("Error generating onboarding reaction: %s", e)
         # Return fallback message instead of error
         fallback_message = "Thank you for sharing that. Let's keep going." if not request.is_resume else "Welcome back! Let's continue where you left off."
         return OnboardingReactionResponse(
@@ -403,23 +480,34 @@ async def health_check():
     - Provider status
     - Configuration status
     - API key validation (without exposing keys)
+    
+    The result is cached for a few seconds so frequent readiness probes
+    don't repeatedly touch the AI service.
     """
+    now = time.monotonic()
+    if _health_cache["payload"] is not None and now - _health_cache["ts"] < HEALTH_CACHE_TTL_SECONDS:
+        return _health_cache["payload"]
+    
     try:
         ai_service = get_ai_service()
         provider_name = ai_service.provider.get_provider_name()
         
-        return {
+        payload = {
             "status": "healthy",
             "provider": provider_name,
             "config_loaded": True,
             "api_key_configured": True
         }
     except Exception as e:
-        logger.error(f"AI services health check failed: {e}")
-        return {
+        logger.error("AI services health check failed: %s", e)
+        payload = {
             "status": "unhealthy",
             "error": str(e),
             "provider": None,
             "config_loaded": False,
             "api_key_configured": False
-        }
\ No newline at end of file
+        }
+    
+    _health_cache["payload"] = payload
+    _health_cache["ts"] = now
+    return payload
\ No newline at end of file
@@ -2,13 +2,19 @@
 Analytics Models
 Data models for event tracking and milestone detection.
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Dict, Any, Literal
-from datetime import datetime
-from enum import Enum
+from datetime import datetime, timezone
+from enum import StrEnum
+import uuid
 
 
-class EventType(str, Enum):
+def utc_now() -> datetime:
+    """Current time as a timezone-aware UTC datetime"""
+    return datetime.now(timezone.utc)
+
+
+class EventType(StrEnum):
     """Types of trackable events"""
     # User actions
     PROFILE_CREATED = "profile_created"
@@ -35,7 +41,7 @@ class EventType(str, Enum):
     PAGE_VIEWED = "page_viewed"
 
 
-class MilestoneType(str, Enum):
+class MilestoneType(StrEnum):
     """Types of milestones"""
     FIRST_DEBT_ADDED = "first_debt_added"
     FIRST_SCENARIO_CREATED = "first_scenario_created"
@@ -51,17 +57,21 @@ class MilestoneType(str, Enum):
 
 class AnalyticsEvent(BaseModel):
     """Model for tracking user events"""
-    event_id: str = Field(default_factory=lambda: str(__import__('uuid').uuid4()))
+    model_config = ConfigDict(extra="ignore", frozen=True)
+    
+    event_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     profile_id: str = Field(..., description="Profile ID")
     event_type: EventType = Field(..., description="Type of event")
     event_data: Optional[Dict[str, Any]] = Field(None, description="Additional event data")
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=utc_now)
     session_id: Optional[str] = Field(None, description="Session identifier")
     user_agent: Optional[str] = Field(None, description="User agent string")
 
 
 class TrackEventRequest(BaseModel):
     """Request model for tracking an event"""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+    
     profile_id: str = Field(..., description="Profile ID")
     event_type: EventType = Field(..., description="Type of event")
     event_data: Optional[Dict[str, Any]] = Field(None, description="Additional event data")
@@ -78,12 +88,12 @@ class TrackEventResponse(BaseModel):
 
 class Milestone(BaseModel):
     """Model for user milestones"""
-    milestone_id: str = Field(default_factory=lambda: str(__import__('uuid').uuid4()))
+    milestone_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     profile_id: str = Field(..., description="Profile ID")
     milestone_type: MilestoneType = Field(..., description="Type of milestone")
     title: str = Field(..., description="Milestone title")
     description: str = Field(..., description="Milestone description")
-    achieved_at: datetime = Field(default_factory=datetime.utcnow)
+    achieved_at: datetime = Field(default_factory=utc_now)
     celebration_shown: bool = Field(default=False, description="Whether celebration was shown to user")
     metadata: Optional[Dict[str, Any]] = Field(None, description="Additional milestone data")
 
@@ -102,6 +112,12 @@ class CheckMilestonesResponse(BaseModel):
     total_milestones: int = Field(..., description="Total milestones achieved by user")
 
 
+class MarkMilestonesShownRequest(BaseModel):
+    """Request model for marking several milestones as shown"""
+    profile_id: str = Field(..., description="Profile ID that owns the milestones")
+    milestone_ids: List[str] = Field(..., min_length=1, max_length=100, description="Milestones to mark as shown")
+
+
 class MilestoneListResponse(BaseModel):
     """Response model for listing milestones"""
     milestones: List[Milestone]
@@ -3,15 +3,21 @@ Analytics Routes
 API endpoints for event tracking and milestone detection.
 """
 from fastapi import APIRouter, HTTPException, status
-from typing import List
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from typing import List, Dict, Any, AsyncIterator
+import asyncio
 import logging
 
+import orjson
+
 from .models import (
     TrackEventRequest,
     TrackEventResponse,
     CheckMilestonesRequest,
     CheckMilestonesResponse,
+    MarkMilestonesShownRequest,
     MilestoneListResponse,
+    Milestone,
     AnalyticsEvent,
     EventSummary
 )
@@ -21,6 +27,33 @@ from ..shared.database import get_database
 router = APIRouter(prefix="/api/v1/analytics", tags=["Analytics"])
 logger = logging.getLogger(__name__)
 
+# The service is a process-wide singleton; bind it once instead of per request
+analytics_service = get_analytics_service()
+
+
+# Only the fields MilestoneListResponse returns; _id is dropped server-side
+MILESTONE_PROJECTION = {"_id": 0, **{field: 1 for field in Milestone.model_fields}}
+MILESTONE_BATCH_SIZE = 200
+
+
+async def _stream_milestone_list(
+    first_batch: List[Dict[str, Any]],
+    cursor,
+    total_count: int,
+    unshown_count: int
+) -> AsyncIterator[bytes]:
+    """Encode a MilestoneListResponse body one milestone at a time"""
+    yield b'{"milestones":['
+    separator = b""
+    for milestone in first_batch:
+        yield separator + orjson.dumps(milestone)
+        separator = b","
+    if len(first_batch) == MILESTONE_BATCH_SIZE:
+        async for milestone in cursor:
+            yield separator + orjson.dumps(milestone)
+            separator = b","
+    yield b'],"total_count":%d,"unshown_count":%d}' % (total_count, unshown_count)
+
 
 # ============================================================================
 # Event Tracking Endpoints
@@ -67,7 +100,6 @@ async def track_event(request: TrackEventRequest):
     """
     try:
         db = await get_database()
-        analytics_service = get_analytics_service()
         
         # Create analytics event
         event = AnalyticsEvent(
@@ -77,23 +109,23 @@ async def track_event(request: TrackEventRequest):
             session_id=request.session_id
         )
         
-        # Track the event
+        # Track the event, then check for milestones it triggers; detection
+        # only starts once the event is stored
         event_id = await analytics_service.track_event(db, event)
-        
-        # Check for new milestones triggered by this event
-        milestone_detector = analytics_service.milestone_detector
-        new_milestones = await milestone_detector.check_milestones(
+        new_milestones = await analytics_service.milestone_detector.check_milestones(
             profile_id=request.profile_id,
             db=db,
             trigger_event=request.event_type
         )
         
         # Store any new milestones
-        if new_milestones:
-            for milestone in new_milestones:
-                milestone_dict = milestone.model_dump()
-                await db.milestones.insert_one(milestone_dict)
-                logger.info(f"New milestone achieved: {milestone.milestone_type} for profile {request.profile_id}")
+        stored_milestones = await analytics_service.save_milestones(db, new_milestones)
+        if logger.isEnabledFor(logging.INFO):
+            for milestone in stored_milestones:
+                logger.info(
+                    "New milestone achieved: %s for profile %s", milestone["milestone_type"], request.profile_id,
+                    extra={"milestone_type": milestone["milestone_type"], "profile_id": request.profile_id}
+                )
         
         return TrackEventResponse(
             success=True,
@@ -103,7 +135,7 @@ async def track_event(request: TrackEventRequest):
         )
         
     except Exception as e:
-        logger.error(f"Error tracking event: {e}")
+        logger.exception("Error tracking event: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to track event: {str(e)}"
@@ -139,7 +171,6 @@ async def get_event_summary(profile_id: str):
     """
     try:
         db = await get_database()
-        analytics_service = get_analytics_service()
         
         summary = await analytics_service.get_event_summary(db, profile_id)
         
@@ -149,7 +180,7 @@ async def get_event_summary(profile_id: str):
         )
         
     except Exception as e:
-        logger.error(f"Error getting event summary: {e}")
+        logger.exception("Error getting event summary: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to get event summary"
@@ -205,35 +236,34 @@ async def check_milestones(request: CheckMilestonesRequest):
     """
     try:
         db = await get_database()
-        analytics_service = get_analytics_service()
+        
+        milestone_detector = analytics_service.milestone_detector
         
         # Check for new milestones
-        new_milestones = await analytics_service.milestone_detector.check_milestones(
+        existing_milestones, new_milestones = await milestone_detector.detect(
             profile_id=request.profile_id,
             db=db,
             trigger_event=request.trigger_event
         )
         
-        # Store new milestones in database
-        if new_milestones:
-            for milestone in new_milestones:
-                milestone_dict = milestone.model_dump()
-                await db.milestones.insert_one(milestone_dict)
+        # Store new milestones in database; the stored dicts double as the response body
+        milestone_dicts = await analytics_service.save_milestones(db, new_milestones)
         
-        # Get total milestone count
-        total_milestones = await db.milestones.count_documents({"profile_id": request.profile_id})
+        # Each milestone type is achieved at most once, so the total follows from what we've read
+        total_milestones = len(existing_milestones) + len(milestone_dicts)
         
-        message = f"Found {len(new_milestones)} new milestone(s)" if new_milestones else "No new milestones"
+        message = f"Found {len(milestone_dicts)} new milestone(s)" if milestone_dicts else "No new milestones"
         
-        return CheckMilestonesResponse(
-            success=True,
-            message=message,
-            new_milestones=new_milestones,
-            total_milestones=total_milestones
-        )
+        # Milestones are already validated models, so skip re-validating the response
+        return ORJSONResponse({
+            "success": True,
+            "message": message,
+            "new_milestones": milestone_dicts,
+            "total_milestones": total_milestones
+        })
         
     except Exception as e:
-        logger.error(f"Error checking milestones: {e}")
+        logger.exception("Error checking milestones: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to check milestones"
@@ -279,33 +309,82 @@ async def get_milestones(profile_id: str, unshown_only: bool = False):
         if unshown_only:
             query["celebration_shown"] = False
         
-        # Fetch milestones
-        milestones = []
-        async for milestone in db.milestones.find(query).sort("achieved_at", -1):
-            milestone.pop("_id", None)
-            milestones.append(milestone)
+        cursor = (
+            db.milestones.find(query, MILESTONE_PROJECTION)
+            .sort("achieved_at", -1)
+            .batch_size(MILESTONE_BATCH_SIZE)
+        )
         
-        # Get counts
-        total_count = await db.milestones.count_documents({"profile_id": profile_id})
-        unshown_count = await db.milestones.count_documents({
-            "profile_id": profile_id,
-            "celebration_shown": False
-        })
+        # Fetch the first batch and counts concurrently, so query errors still
+        # surface as a 500 before any of the body is sent
+        first_batch, (total_count, unshown_count) = await asyncio.gather(
+            cursor.to_list(length=MILESTONE_BATCH_SIZE),
+            analytics_service.get_milestone_counts(db, profile_id)
+        )
         
-        return MilestoneListResponse(
-            milestones=milestones,
-            total_count=total_count,
-            unshown_count=unshown_count
+        # Stream the rest of the cursor rather than building the whole list
+        return StreamingResponse(
+            _stream_milestone_list(first_batch, cursor, total_count, unshown_count),
+            media_type="application/json"
         )
         
     except Exception as e:
-        logger.error(f"Error getting milestones: {e}")
+        logger.exception("Error getting milestones: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to get milestones"
         )
 
 
+@router.post("/milestones/shown", status_code=status.HTTP_202_ACCEPTED)
+async def mark_milestones_shown(request: MarkMilestonesShownRequest):
+    """
+    Mark several milestones as shown to the user.
+    
+    Updates are queued and written in coalesced batches (or written at once
+    when the batch writer isn't running), so unknown milestone IDs are
+    ignored rather than reported. Use
+    `PATCH /milestones/{milestone_id}/shown` when a 404 for a missing
+    milestone is needed.
+    
+    **Example Request:**
+    ```json
+    {
+      "profile_id": "user123",
+      "milestone_ids": ["a1b2c3", "d4e5f6"]
+    }
+    ```
+    
+    **Example Response:**
+    ```json
+    {
+      "success": true,
+      "message": "2 milestones queued to be marked as shown"
+    }
+    ```
+    """
+    try:
+        writer = analytics_service.shown_writer
+        if writer.running:
+            writer.enqueue(request.profile_id, request.milestone_ids)
+            message = f"{len(request.milestone_ids)} milestones queued to be marked as shown"
+        else:
+            await writer.write(await get_database(), request.profile_id, request.milestone_ids)
+            message = f"{len(request.milestone_ids)} milestones marked as shown"
+        
+        return {
+            "success": True,
+            "message": message
+        }
+        
+    except Exception as e:
+        logger.exception("Error marking milestones as shown: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to update milestones"
+        )
+
+
 @router.patch("/milestones/{milestone_id}/shown")
 async def mark_milestone_shown(milestone_id: str):
     """
@@ -325,17 +404,21 @@ async def mark_milestone_shown(milestone_id: str):
     try:
         db = await get_database()
         
-        result = await db.milestones.update_one(
+        # Returns the owning profile (or None on a miss) in the same round trip
+        milestone = await db.milestones.find_one_and_update(
             {"milestone_id": milestone_id},
-            {"$set": {"celebration_shown": True}}
+            {"$set": {"celebration_shown": True}},
+            projection={"_id": 0, "profile_id": 1}
         )
         
-        if result.matched_count == 0:
+        if milestone is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Milestone not found"
             )
         
+        analytics_service.invalidate_milestone_counts(milestone.get("profile_id"))
+        
         return {
             "success": True,
             "message": "Milestone marked as shown"
@@ -344,7 +427,7 @@ async def mark_milestone_shown(milestone_id: str):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error marking milestone as shown: {e}")
+        logger.exception("Error marking milestone as shown: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to update milestone"
@@ -2,9 +2,18 @@
 Analytics Service
 Business logic for event tracking and milestone detection.
 """
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Optional, Tuple, Mapping
+from collections import Counter, OrderedDict
+import asyncio
 import logging
+import time
+from types import MappingProxyType
+from weakref import WeakValueDictionary
+
+from pydantic import TypeAdapter
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 
 from .models import (
     AnalyticsEvent,
@@ -15,175 +24,336 @@ from .models import (
 
 logger = logging.getLogger(__name__)
 
+# Prebuilt serializer for the event write path
+_EVENT_ADAPTER = TypeAdapter(AnalyticsEvent)
+
+# Milestone counts are reused briefly across page refreshes
+MILESTONE_COUNTS_TTL_SECONDS = 5.0
+MILESTONE_COUNTS_CACHE_SIZE = 10_000
+
+# Achieved milestones never go away, so the event path can reuse them for longer
+ACHIEVED_MILESTONES_TTL_SECONDS = 3600.0
+ACHIEVED_MILESTONES_CACHE_SIZE = 10_000
+
+# High-frequency events acknowledged as soon as they are queued
+FIRE_AND_FORGET_EVENTS = frozenset({EventType.PAGE_VIEWED, EventType.SCENARIO_VIEWED})
+
+ALL_MILESTONES = frozenset(MilestoneType)
+_BALANCE_MILESTONES = frozenset({
+    MilestoneType.BALANCE_REDUCED_25,
+    MilestoneType.BALANCE_REDUCED_50,
+    MilestoneType.BALANCE_REDUCED_75,
+})
+
+# Milestones each event can complete. Events that don't change debts can't
+# complete any; events not listed here get the full check.
+MILESTONES_BY_TRIGGER: Mapping[EventType, frozenset] = MappingProxyType({
+    EventType.DEBT_ADDED: frozenset({MilestoneType.FIRST_DEBT_ADDED}),
+    EventType.DEBT_UPDATED: _BALANCE_MILESTONES | {MilestoneType.FIRST_DEBT_PAID_OFF, MilestoneType.DEBT_FREE},
+    EventType.DEBT_PAID_OFF: _BALANCE_MILESTONES | {MilestoneType.FIRST_DEBT_PAID_OFF, MilestoneType.DEBT_FREE},
+    EventType.DEBT_DELETED: _BALANCE_MILESTONES | {MilestoneType.DEBT_FREE},
+    EventType.SCENARIO_CREATED: frozenset({MilestoneType.FIRST_SCENARIO_CREATED}),
+    EventType.PROFILE_CREATED: frozenset(),
+    EventType.PROFILE_UPDATED: frozenset(),
+    EventType.SCENARIO_VIEWED: frozenset(),
+    EventType.WHAT_IF_ANALYZED: frozenset(),
+    EventType.STRATEGY_COMPARED: frozenset(),
+    EventType.AI_INSIGHT_REQUESTED: frozenset(),
+    EventType.AI_QUESTION_ASKED: frozenset(),
+    EventType.DATA_EXPORTED: frozenset(),
+    EventType.PAGE_VIEWED: frozenset(),
+})
+
+
+def milestone_candidates(trigger_event: Optional[EventType]) -> frozenset:
+    """Milestone types that could be newly completed after the given event"""
+    if trigger_event is None:
+        return ALL_MILESTONES
+    return MILESTONES_BY_TRIGGER.get(trigger_event, ALL_MILESTONES)
+
+# Balance reduction milestones, checked from the largest threshold down
+BALANCE_REDUCTION_THRESHOLDS = (
+    (0.75, MilestoneType.BALANCE_REDUCED_75),
+    (0.50, MilestoneType.BALANCE_REDUCED_50),
+    (0.25, MilestoneType.BALANCE_REDUCED_25),
+)
+
+
+def balance_reduction(total_original: float, total_current: float) -> float:
+    """
+    Fraction of the original total balance that has been paid down.
+    
+    Debts without an `original_balance` count as unchanged since they were
+    added, so they contribute no reduction.
+    """
+    if not total_original or total_original <= 0:
+        return 0.0
+    return max(0.0, 1.0 - (total_current or 0.0) / total_original)
+
+
+# Title and description shown for each milestone type
+MILESTONE_DEFINITIONS: Mapping[MilestoneType, Tuple[str, str]] = MappingProxyType({
+    MilestoneType.FIRST_DEBT_ADDED: (
+        "First Step Taken! 🎯",
+        "You've added your first debt. This is the beginning of your journey to financial freedom!"
+    ),
+    MilestoneType.FIRST_SCENARIO_CREATED: (
+        "Planning Ahead! 📊",
+        "You've created your first payoff scenario. Great job planning your path to debt freedom!"
+    ),
+    MilestoneType.FIRST_DEBT_PAID_OFF: (
+        "First Victory! 🎉",
+        "Congratulations! You've paid off your first debt. This is a huge accomplishment!"
+    ),
+    MilestoneType.HALFWAY_TO_DEBT_FREE: (
+        "Halfway There! 🏃",
+        "You're 50% of the way to being debt-free. Keep up the amazing work!"
+    ),
+    MilestoneType.DEBT_FREE: (
+        "Debt Free! 🎊",
+        "Incredible! You've paid off all your debts. You're officially debt-free!"
+    ),
+    MilestoneType.BALANCE_REDUCED_25: (
+        "Quarter Way Down! 💪",
+        "You've reduced your total debt balance by 25%. Excellent progress!"
+    ),
+    MilestoneType.BALANCE_REDUCED_50: (
+        "Half Way Down! 🌟",
+        "Amazing! You've reduced your total debt balance by 50%!"
+    ),
+    MilestoneType.BALANCE_REDUCED_75: (
+        "Almost There! 🚀",
+        "Fantastic! You've reduced your total debt balance by 75%!"
+    ),
+    MilestoneType.TOTAL_INTEREST_SAVED: (
+        "Money Saved! 💰",
+        "Through smart planning, you've saved significant money on interest!"
+    ),
+    MilestoneType.CONSISTENT_PAYMENTS: (
+        "Consistency Champion! ⭐",
+        "You've made consistent payments for 3 months in a row. Great discipline!"
+    )
+})
+
+DEFAULT_MILESTONE_DEFINITION = ("Milestone Achieved!", "You've reached a new milestone!")
+
 
 class MilestoneDetector:
     """Service for detecting user milestones"""
     
     def __init__(self):
         """Initialize the milestone detector"""
-        self.milestone_definitions = self._get_milestone_definitions()
+        # profile_id -> (cached_at, achieved milestone types)
+        self._achieved: "OrderedDict[str, Tuple[float, set]]" = OrderedDict()
+        # profile_id -> lock serializing milestone checks; dropped once no check holds it
+        self._profile_locks: "WeakValueDictionary[str, asyncio.Lock]" = WeakValueDictionary()
     
-    def _get_milestone_definitions(self) -> Dict[MilestoneType, Dict[str, str]]:
-        """Get milestone definitions with titles and descriptions"""
+    async def get_existing_milestones(self, profile_id: str, db, use_cache: bool = False) -> set:
+        """
+        Get the milestone types a profile has already achieved.
+        
+        With `use_cache`, a recently read set is reused. It may miss types
+        stored by another worker, which `AnalyticsService.save_milestones`
+        tolerates by never storing a type twice.
+        """
+        if use_cache:
+            cached = self._achieved.get(profile_id)
+            if cached and time.monotonic() - cached[0] < ACHIEVED_MILESTONES_TTL_SECONDS:
+                return set(cached[1])
+        
+        existing_milestones = set(await db.milestones.distinct("milestone_type", {"profile_id": profile_id}))
+        self.remember_milestones(profile_id, existing_milestones, replace=True)
+        return existing_milestones
+    
+    def remember_milestones(self, profile_id: str, milestone_types, replace: bool = False):
+        """Record achieved milestone types in the per-profile cache"""
+        cached = self._achieved.get(profile_id)
+        if cached and not replace:
+            cached[1].update(milestone_types)
+        else:
+            self._achieved[profile_id] = (time.monotonic(), set(milestone_types))
+        self._achieved.move_to_end(profile_id)
+        if len(self._achieved) > ACHIEVED_MILESTONES_CACHE_SIZE:
+            self._achieved.popitem(last=False)
+    
+    def forget_milestones(self, profile_id: str):
+        """Drop a profile's cached milestone types so the next check re-reads them"""
+        self._achieved.pop(profile_id, None)
+    
+    async def get_debt_stats(self, profile_id: str, db) -> Dict[str, float]:
+        """
+        Get the debt counts and balance totals milestone checks need.
+        
+        All figures come back from a single `$facet` aggregation.
+        """
+        pipeline = [
+            {"$match": {"profile_id": profile_id}},
+            {"$facet": {
+                "total": [{"$count": "n"}],
+                "paid_off": [{"$match": {"status": "paid_off"}}, {"$count": "n"}],
+                "active": [{"$match": {"status": "active"}}, {"$count": "n"}],
+                "balances": [{"$group": {
+                    "_id": None,
+                    "current": {"$sum": "$balance"},
+                    "original": {"$sum": {"$ifNull": ["$original_balance", "$balance"]}}
+                }}]
+            }}
+        ]
+        results = await db.debts.aggregate(pipeline).to_list(length=1)
+        facets = results[0] if results else {}
+        
+        def count(name: str) -> int:
+            rows = facets.get(name) or []
+            return rows[0]["n"] if rows else 0
+        
+        balances = (facets.get("balances") or [{}])[0]
         return {
-            MilestoneType.FIRST_DEBT_ADDED: {
-                "title": "First Step Taken! 🎯",
-                "description": "You've added your first debt. This is the beginning of your journey to financial freedom!"
-            },
-            MilestoneType.FIRST_SCENARIO_CREATED: {
-                "title": "Planning Ahead! 📊",
-                "description": "You've created your first payoff scenario. Great job planning your path to debt freedom!"
-            },
-            MilestoneType.FIRST_DEBT_PAID_OFF: {
-                "title": "First Victory! 🎉",
-                "description": "Congratulations! You've paid off your first debt. This is a huge accomplishment!"
-            },
-            MilestoneType.HALFWAY_TO_DEBT_FREE: {
-                "title": "Halfway There! 🏃",
-                "description": "You're 50% of the way to being debt-free. Keep up the amazing work!"
-            },
-            MilestoneType.DEBT_FREE: {
-                "title": "Debt Free! 🎊",
-                "description": "Incredible! You've paid off all your debts. You're officially debt-free!"
-            },
-            MilestoneType.BALANCE_REDUCED_25: {
-                "title": "Quarter Way Down! 💪",
-                "description": "You've reduced your total debt balance by 25%. Excellent progress!"
-            },
-            MilestoneType.BALANCE_REDUCED_50: {
-                "title": "Half Way Down! 🌟",
-                "description": "Amazing! You've reduced your total debt balance by 50%!"
-            },
-            MilestoneType.BALANCE_REDUCED_75: {
-                "title": "Almost There! 🚀",
-                "description": "Fantastic! You've reduced your total debt balance by 75%!"
-            },
-            MilestoneType.TOTAL_INTEREST_SAVED: {
-                "title": "Money Saved! 💰",
-                "description": "Through smart planning, you've saved significant money on interest!"
-            },
-            MilestoneType.CONSISTENT_PAYMENTS: {
-                "title": "Consistency Champion! ⭐",
-                "description": "You've made consistent payments for 3 months in a row. Great discipline!"
-            }
+            "debt_count": count("total"),
+            "paid_off_count": count("paid_off"),
+            "active_count": count("active"),
+            "current_balance": balances.get("current", 0.0),
+            "original_balance": balances.get("original", 0.0)
         }
     
-    async def check_milestones(
+    async def detect(
         self,
         profile_id: str,
         db,
-        trigger_event: Optional[EventType] = None
-    ) -> List[Milestone]:
+        trigger_event: Optional[EventType] = None,
+        use_cache: bool = False
+    ) -> Tuple[set, List[Milestone]]:
         """
-        Check for new milestones based on user's current state.
+        Check for new milestones, also returning those already achieved.
         
         Args:
             profile_id: User's profile ID
             db: Database connection
             trigger_event: Event that triggered the check
+            use_cache: Reuse a recently read set of achieved milestones
             
         Returns:
-            List of newly achieved milestones
+            Tuple of (already-achieved milestone types, newly achieved milestones)
         """
+        candidates = milestone_candidates(trigger_event)
+        if not candidates:
+            return await self.get_existing_milestones(profile_id, db, use_cache), []
+        
+        # Existing milestones (to avoid duplicates) and debt stats are independent reads
+        existing_milestones, stats = await asyncio.gather(
+            self.get_existing_milestones(profile_id, db, use_cache),
+            self.get_debt_stats(profile_id, db)
+        )
+        
+        # Skip milestones already achieved or not reachable from this event
+        skipped = existing_milestones | (ALL_MILESTONES - candidates)
         new_milestones = []
+        debt_count = stats["debt_count"]
         
-        try:
-            # Get existing milestones to avoid duplicates
-            existing_milestones = set()
-            async for milestone in db.milestones.find({"profile_id": profile_id}):
-                existing_milestones.add(milestone["milestone_type"])
-            
-            # Check for first debt added
-            if MilestoneType.FIRST_DEBT_ADDED not in existing_milestones:
-                debt_count = await db.debts.count_documents({"profile_id": profile_id})
-                if debt_count >= 1:
-                    new_milestones.append(
-                        await self._create_milestone(
-                            profile_id,
-                            MilestoneType.FIRST_DEBT_ADDED,
-                            {"debt_count": debt_count}
-                        )
-                    )
-            
-            # Check for first scenario created
-            if MilestoneType.FIRST_SCENARIO_CREATED not in existing_milestones:
-                # Note: Scenarios are not yet persisted in DB, so this is a placeholder
-                # In production, check scenario count from database
-                pass
-            
-            # Check for first debt paid off
-            if MilestoneType.FIRST_DEBT_PAID_OFF not in existing_milestones:
-                paid_off_count = await db.debts.count_documents({
-                    "profile_id": profile_id,
-                    "status": "paid_off"
-                })
-                if paid_off_count >= 1:
-                    new_milestones.append(
-                        await self._create_milestone(
-                            profile_id,
-                            MilestoneType.FIRST_DEBT_PAID_OFF,
-                            {"paid_off_count": paid_off_count}
-                        )
-                    )
-            
-            # Check for balance reduction milestones
+        # Check for first debt added
+        if MilestoneType.FIRST_DEBT_ADDED not in skipped and debt_count >= 1:
+            new_milestones.append(
+                await self._create_milestone(
+                    profile_id,
+                    MilestoneType.FIRST_DEBT_ADDED,
+                    {"debt_count": debt_count}
+                )
+            )
+        
+        # Check for first scenario created
+        if MilestoneType.FIRST_SCENARIO_CREATED not in skipped:
+            # Note: Scenarios are not yet persisted in DB, so this is a placeholder
+            # In production, check scenario count from database
+            pass
+        
+        # Check for first debt paid off
+        paid_off_count = stats["paid_off_count"]
+        if MilestoneType.FIRST_DEBT_PAID_OFF not in skipped and paid_off_count >= 1:
+            new_milestones.append(
+                await self._create_milestone(
+                    profile_id,
+                    MilestoneType.FIRST_DEBT_PAID_OFF,
+                    {"paid_off_count": paid_off_count}
+                )
+            )
+        
+        # Check for balance reduction milestones
+        if debt_count:
             await self._check_balance_reduction_milestones(
                 profile_id,
-                db,
-                existing_milestones,
+                stats,
+                skipped,
                 new_milestones
             )
+        
+        # Check for debt-free milestone
+        if (
+            MilestoneType.DEBT_FREE not in skipped
+            and debt_count > 0
+            and stats["active_count"] == 0
+        ):
+            new_milestones.append(
+                await self._create_milestone(
+                    profile_id,
+                    MilestoneType.DEBT_FREE,
+                    {"total_debts_paid": debt_count}
+                )
+            )
+        
+        return existing_milestones, new_milestones
+    
+    async def check_milestones(
+        self,
+        profile_id: str,
+        db,
+        trigger_event: Optional[EventType] = None
+    ) -> List[Milestone]:
+        """
+        Check for new milestones based on user's current state.
+        
+        Args:
+            profile_id: User's profile ID
+            db: Database connection
+            trigger_event: Event that triggered the check
             
-            # Check for debt-free milestone
-            if MilestoneType.DEBT_FREE not in existing_milestones:
-                active_debt_count = await db.debts.count_documents({
-                    "profile_id": profile_id,
-                    "status": "active"
-                })
-                total_debt_count = await db.debts.count_documents({"profile_id": profile_id})
-                
-                if total_debt_count > 0 and active_debt_count == 0:
-                    new_milestones.append(
-                        await self._create_milestone(
-                            profile_id,
-                            MilestoneType.DEBT_FREE,
-                            {"total_debts_paid": total_debt_count}
-                        )
-                    )
-            
+        Returns:
+            List of newly achieved milestones
+        """
+        # Most events can't complete a milestone; skip the database entirely
+        if not milestone_candidates(trigger_event):
+            return []
+        
+        try:
+            # Concurrent checks for one profile run one at a time. Found types are
+            # only cached once save_milestones stores them, and its upsert keeps a
+            # type found by two queued checks from being stored twice
+            lock = self._profile_locks.setdefault(profile_id, asyncio.Lock())
+            async with lock:
+                _, new_milestones = await self.detect(profile_id, db, trigger_event, use_cache=True)
             return new_milestones
             
         except Exception as e:
-            logger.error(f"Error checking milestones: {e}")
+            logger.exception("Error checking milestones: %s", e)
             return []
     
     async def _check_balance_reduction_milestones(
         self,
         profile_id: str,
-        db,
+        stats: Dict[str, float],
         existing_milestones: set,
         new_milestones: List[Milestone]
     ):
         """Check for balance reduction milestones (25%, 50%, 75%)"""
-        try:
-            # Get all debts for this profile
-            debts = []
-            async for debt in db.debts.find({"profile_id": profile_id}):
-                debts.append(debt)
-            
-            if not debts:
-                return
-            
-            # Calculate original total balance (from created_at or initial_balance field)
-            # For now, we'll use current balance as a placeholder
-            # In production, track original_balance when debt is first added
-            current_total = sum(d.get("balance", 0) for d in debts)
-            
-            # Placeholder: In production, compare against original_balance
-            # For now, we'll skip these milestones as we don't have historical data
-            
-        except Exception as e:
-            logger.error(f"Error checking balance reduction milestones: {e}")
+        # original_balance is not tracked yet, so this stays at 0 until it is
+        reduced = balance_reduction(stats["original_balance"], stats["current_balance"])
+        for threshold, milestone_type in BALANCE_REDUCTION_THRESHOLDS:
+            if milestone_type not in existing_milestones and reduced >= threshold:
+                new_milestones.append(
+                    await self._create_milestone(
+                        profile_id,
+                        milestone_type,
+                        {"balance_reduced": round(reduced, 4)}
+                    )
+                )
     
     async def _create_milestone(
         self,
@@ -192,25 +362,228 @@ class MilestoneDetector:
         metadata: Optional[Dict[str, Any]] = None
     ) -> Milestone:
         """Create a new milestone"""
-        definition = self.milestone_definitions.get(milestone_type, {})
+        title, description = MILESTONE_DEFINITIONS.get(milestone_type, DEFAULT_MILESTONE_DEFINITION)
         
         return Milestone(
             profile_id=profile_id,
             milestone_type=milestone_type,
-            title=definition.get("title", "Milestone Achieved!"),
-            description=definition.get("description", "You've reached a new milestone!"),
-            achieved_at=datetime.utcnow(),
+            title=title,
+            description=description,
             celebration_shown=False,
             metadata=metadata
         )
 
 
+class BatchWriter(ABC):
+    """Background task that drains a queue and writes items in batches"""
+    
+    def __init__(self, max_batch: int, max_delay_ms: int):
+        """
+        Initialize the batch writer.
+        
+        Args:
+            max_batch: Maximum number of items written per round trip
+            max_delay_ms: Maximum time an item waits for its batch to fill
+        """
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000
+        self._db = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    @property
+    def running(self) -> bool:
+        """Whether the background flusher is accepting items"""
+        return self._task is not None and not self._task.done()
+    
+    def start(self, db):
+        """Start the background flusher on the running event loop"""
+        if self.running:
+            return
+        self._db = db
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        """Flush pending items and stop the background flusher (graceful shutdown)"""
+        if not self.running:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+    
+    def _ends_batch(self, item) -> bool:
+        """Whether an item should close its batch immediately"""
+        return False
+    
+    async def _run(self):
+        """Drain the queue, writing up to max_batch items per round trip"""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch and not self._ends_batch(batch[-1]):
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+    
+    @abstractmethod
+    async def _flush(self, batch: list):
+        """Write one batch"""
+
+
+class EventBatcher(BatchWriter):
+    """Coalesces analytics event inserts into batched insert_many calls"""
+    
+    def __init__(self, max_batch: int = 500, max_delay_ms: int = 50):
+        super().__init__(max_batch, max_delay_ms)
+    
+    async def enqueue(self, event_dict: Dict[str, Any], wait: bool = True):
+        """
+        Queue an event for the next batch.
+        
+        Args:
+            event_dict: Event document to insert
+            wait: Wait until the batch containing the event has been written
+        
+        Raises:
+            Exception: If `wait` is set and the event could not be persisted
+        """
+        if not wait:
+            self._queue.put_nowait((event_dict, None))
+            return
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((event_dict, future))
+        await future
+    
+    async def flush(self):
+        """Write every event queued so far without waiting for the batch delay"""
+        if not self.running:
+            return
+        barrier = asyncio.get_running_loop().create_future()
+        await self._queue.put((None, barrier))
+        await barrier
+    
+    def _ends_batch(self, item) -> bool:
+        # flush() barriers close the batch so queued events are written at once
+        return item[0] is None
+    
+    async def _flush(self, batch: List[Tuple[Optional[Dict[str, Any]], Optional[asyncio.Future]]]):
+        """Write one batch and resolve each event's future"""
+        barriers = [future for event_dict, future in batch if event_dict is None]
+        events = [(event_dict, future) for event_dict, future in batch if event_dict is not None]
+        
+        failed: Dict[int, Exception] = {}
+        if events:
+            try:
+                await self._db.analytics_events.insert_many(
+                    [event_dict for event_dict, _ in events],
+                    ordered=False
+                )
+            except BulkWriteError as e:
+                # Unordered inserts still write every document that didn't fail
+                for write_error in e.details.get("writeErrors", []):
+                    failed[write_error["index"]] = Exception(write_error.get("errmsg", "Write failed"))
+            except Exception as e:
+                failed = {index: e for index in range(len(events))}
+        
+        if failed:
+            logger.error("Failed to write %d of %d analytics events", len(failed), len(events))
+        
+        for index, (_, future) in enumerate(events):
+            if future is None or future.done():
+                continue
+            if index in failed:
+                future.set_exception(failed[index])
+            else:
+                future.set_result(None)
+        
+        for barrier in barriers:
+            if not barrier.done():
+                barrier.set_result(None)
+
+
+class MilestoneShownWriter(BatchWriter):
+    """Coalesces celebration_shown updates into batched bulk writes"""
+    
+    def __init__(self, on_written=None, max_batch: int = 100, max_delay_ms: int = 200):
+        """
+        Initialize the writer.
+        
+        Args:
+            on_written: Called with each profile_id whose milestones were updated
+            max_batch: Maximum number of updates per bulk_write
+            max_delay_ms: Maximum time an update waits for its batch to fill
+        """
+        super().__init__(max_batch, max_delay_ms)
+        self.on_written = on_written
+    
+    def enqueue(self, profile_id: str, milestone_ids: List[str]):
+        """Queue milestones to be marked shown; returns without waiting"""
+        for milestone_id in milestone_ids:
+            self._queue.put_nowait((profile_id, milestone_id))
+    
+    async def write(self, db, profile_id: str, milestone_ids: List[str]):
+        """
+        Mark milestones shown immediately (used when the writer isn't running).
+        
+        Raises:
+            Exception: If the update could not be written
+        """
+        await self._write(db, [(profile_id, milestone_id) for milestone_id in milestone_ids])
+    
+    async def _flush(self, batch: List[Tuple[str, str]]):
+        # Nobody awaits a queued update, so a failed batch can only be logged
+        try:
+            await self._write(self._db, batch)
+        except Exception as e:
+            logger.error("Error marking %d milestones as shown: %s", len(batch), e)
+    
+    async def _write(self, db, batch: List[Tuple[str, str]]):
+        """Apply one batch of updates and notify for each affected profile"""
+        if not batch:
+            return
+        try:
+            await db.milestones.bulk_write(
+                [
+                    UpdateOne(
+                        {"milestone_id": milestone_id, "profile_id": profile_id},
+                        {"$set": {"celebration_shown": True}}
+                    )
+                    for profile_id, milestone_id in batch
+                ],
+                ordered=False
+            )
+        finally:
+            # Notify even on failure: an unordered bulk write may have partly applied
+            if self.on_written:
+                for profile_id in {profile_id for profile_id, _ in batch}:
+                    self.on_written(profile_id)
+
+
 class AnalyticsService:
     """Service for handling analytics operations"""
     
     def __init__(self):
         """Initialize the analytics service"""
         self.milestone_detector = MilestoneDetector()
+        self.event_batcher = EventBatcher()
+        self.shown_writer = MilestoneShownWriter(on_written=self.invalidate_milestone_counts)
+        # profile_id -> (cached_at, total_count, unshown_count)
+        self._milestone_counts: "OrderedDict[str, Tuple[float, int, int]]" = OrderedDict()
     
     async def track_event(
         self,
@@ -228,17 +601,100 @@ class AnalyticsService:
             Event ID
         """
         try:
-            # Store event in database
-            event_dict = event.model_dump()
-            await db.analytics_events.insert_one(event_dict)
+            # Store event in database, coalesced with concurrent events when batching is running.
+            # High-frequency view events are acknowledged once queued.
+            # Unset optional fields are omitted rather than stored as nulls
+            event_dict = _EVENT_ADAPTER.dump_python(event, exclude_none=True)
+            if self.event_batcher.running:
+                await self.event_batcher.enqueue(
+                    event_dict,
+                    wait=event.event_type not in FIRE_AND_FORGET_EVENTS
+                )
+            else:
+                await db.analytics_events.insert_one(event_dict)
             
-            logger.info(f"Tracked event: {event.event_type} for profile {event.profile_id}")
+            logger.info(
+                "Tracked event: %s for profile %s", event.event_type, event.profile_id,
+                extra={"event_type": event.event_type, "profile_id": event.profile_id}
+            )
             
             return event.event_id
             
         except Exception as e:
-            logger.error(f"Error tracking event: {e}")
+            logger.error("Error tracking event: %s", e)
+            raise
+    
+    async def save_milestones(self, db, milestones: List[Milestone]) -> List[Dict[str, Any]]:
+        """
+        Store newly achieved milestones in a single bulk write.
+        
+        Each milestone is upserted on (profile_id, milestone_type), so a type
+        the profile already has is left untouched rather than stored twice.
+        
+        Returns:
+            The milestone dicts actually stored, reusable as response data
+        """
+        if not milestones:
+            return []
+        milestone_dicts = [milestone.model_dump() for milestone in milestones]
+        try:
+            result = await db.milestones.bulk_write(
+                [
+                    UpdateOne(
+                        {"profile_id": milestone_dict["profile_id"], "milestone_type": milestone_dict["milestone_type"]},
+                        {"$setOnInsert": milestone_dict},
+                        upsert=True
+                    )
+                    for milestone_dict in milestone_dicts
+                ],
+                ordered=False
+            )
+        except Exception:
+            # The write may have partly applied; re-read the stored types next time
+            for profile_id in {milestone.profile_id for milestone in milestones}:
+                self.milestone_detector.forget_milestones(profile_id)
             raise
+        
+        for milestone in milestones:
+            self.milestone_detector.remember_milestones(milestone.profile_id, {milestone.milestone_type})
+            self.invalidate_milestone_counts(milestone.profile_id)
+        return [milestone_dicts[index] for index in sorted(result.upserted_ids)]
+    
+    async def get_milestone_counts(self, db, profile_id: str) -> Tuple[int, int]:
+        """
+        Get a profile's total and unshown milestone counts.
+        
+        Counts are cached for a few seconds and invalidated whenever the
+        profile's milestones are written.
+        
+        Returns:
+            Tuple of (total_count, unshown_count)
+        """
+        now = time.monotonic()
+        cached = self._milestone_counts.get(profile_id)
+        if cached and now - cached[0] < MILESTONE_COUNTS_TTL_SECONDS:
+            return cached[1], cached[2]
+        
+        total_count, unshown_count = await asyncio.gather(
+            db.milestones.count_documents({"profile_id": profile_id}),
+            db.milestones.count_documents({
+                "profile_id": profile_id,
+                "celebration_shown": False
+            })
+        )
+        
+        self._milestone_counts[profile_id] = (now, total_count, unshown_count)
+        self._milestone_counts.move_to_end(profile_id)
+        if len(self._milestone_counts) > MILESTONE_COUNTS_CACHE_SIZE:
+            self._milestone_counts.popitem(last=False)
+        return total_count, unshown_count
+    
+    def invalidate_milestone_counts(self, profile_id: Optional[str] = None):
+        """Drop cached milestone counts for one profile, or for all profiles"""
+        if profile_id is None:
+            self._milestone_counts.clear()
+        else:
+            self._milestone_counts.pop(profile_id, None)
     
     async def get_event_summary(
         self,
@@ -256,11 +712,19 @@ class AnalyticsService:
             Event summary
         """
         try:
-            events = []
-            async for event in db.analytics_events.find({"profile_id": profile_id}):
-                events.append(event)
+            # Count and bound events per type on the server; only one row per type comes back
+            pipeline = [
+                {"$match": {"profile_id": profile_id}},
+                {"$group": {
+                    "_id": "$event_type",
+                    "count": {"$sum": 1},
+                    "first": {"$min": "$timestamp"},
+                    "last": {"$max": "$timestamp"}
+                }}
+            ]
+            groups = await db.analytics_events.aggregate(pipeline).to_list(length=None)
             
-            if not events:
+            if not groups:
                 return {
                     "total_events": 0,
                     "events_by_type": {},
@@ -270,29 +734,27 @@ class AnalyticsService:
                 }
             
             # Count events by type
-            events_by_type = {}
-            for event in events:
-                event_type = event.get("event_type")
-                events_by_type[event_type] = events_by_type.get(event_type, 0) + 1
+            events_by_type = Counter({group["_id"]: group["count"] for group in groups})
             
             # Find most common event
-            most_common = max(events_by_type.items(), key=lambda x: x[1])[0] if events_by_type else None
+            most_common = events_by_type.most_common(1)[0][0]
             
             # Get first and last event timestamps
-            timestamps = [e.get("timestamp") for e in events if e.get("timestamp")]
-            first_event = min(timestamps) if timestamps else None
-            last_event = max(timestamps) if timestamps else None
+            firsts = [group["first"] for group in groups if group.get("first")]
+            lasts = [group["last"] for group in groups if group.get("last")]
+            first_event = min(firsts) if firsts else None
+            last_event = max(lasts) if lasts else None
             
             return {
-                "total_events": len(events),
-                "events_by_type": events_by_type,
+                "total_events": events_by_type.total(),
+                "events_by_type": dict(events_by_type),
                 "first_event": first_event,
                 "last_event": last_event,
                 "most_common_event": most_common
             }
             
         except Exception as e:
-            logger.error(f"Error getting event summary: {e}")
+            logger.error("Error getting event summary: %s", e)
             raise
 
 
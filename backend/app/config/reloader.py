@@ -0,0 +1,220 @@
+"""
+Configuration Reloader
+Reloads configuration files, either on request or automatically when a file
+changes on disk.
+
+Each reload parses its YAML in a worker thread so the event loop keeps serving
+requests while files load.
+"""
+
+import asyncio
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ..shared.config_loader import CONFIG_DIR, get_config
+from ..shared.ai_service import get_ai_service, clear_response_caches
+from ..personalization.service import get_personalization_service
+
+logger = logging.getLogger(__name__)
+
+# Process-wide singletons; bind them once instead of per reload
+config_loader = get_config()
+personalization_service = get_personalization_service()
+
+# Config names accepted by /reload, in reporting order; each is loaded from
+# CONFIG_DIR/<name>.yaml
+CONFIG_NAMES = (
+    "calculation_parameters",
+    "recommendation_rules",
+    "ai_prompts",
+    "personalization_rules"
+)
+RELOADABLE_CONFIGS = frozenset(CONFIG_NAMES)
+
+# Watch the config directory and reload edited files (set CONFIG_WATCH=false to
+# rely on /reload only). Set WATCHFILES_FORCE_POLLING=true on filesystems
+# without inotify support, such as network mounts.
+CONFIG_WATCH_ENABLED = os.getenv("CONFIG_WATCH", "true").lower() != "false"
+# Editors often write a file in several steps; wait for changes to settle
+CONFIG_WATCH_DEBOUNCE_MS = 300
+
+# Reloads run one at a time; a config whose file is unchanged since it was last
+# reloaded is reported as reloaded without parsing it again
+_reload_lock = asyncio.Lock()
+# config name -> (mtime_ns, size) of the file as of its last reload
+_loaded_stamps: Dict[str, Tuple[int, int]] = {}
+
+
+# ============================================================================
+# Reload Helpers
+# ============================================================================
+# Each helper returns (reloaded config names, error message or None).
+
+async def _reload_calculation_configs(configs_to_reload) -> Tuple[List[str], Optional[str]]:
+    """Reload calculation parameters and recommendation rules"""
+    try:
+        await asyncio.to_thread(config_loader.reload)
+    except Exception as e:
+        error_msg = f"Failed to reload calculation/recommendation configs: {e}"
+        logger.error(error_msg)
+        return [], error_msg
+    
+    logger.info("Reloaded calculation and recommendation configs")
+    return [
+        name for name in ("calculation_parameters", "recommendation_rules")
+        if name in configs_to_reload
+    ], None
+
+
+async def _reload_ai_prompts() -> Tuple[List[str], Optional[str]]:
+    """Reload AI prompt templates"""
+    try:
+        ai_service = get_ai_service()
+        await asyncio.to_thread(ai_service.config.reload)
+        # Cached responses were built from the old prompts; clear them on the
+        # event loop, which is the only thread that touches those caches
+        clear_response_caches()
+    except Exception as e:
+        error_msg = f"Failed to reload AI prompts: {e}"
+        logger.error(error_msg)
+        return [], error_msg
+    
+    logger.info("Reloaded AI prompts config")
+    return ["ai_prompts"], None
+
+
+async def _reload_personalization_rules() -> Tuple[List[str], Optional[str]]:
+    """Reload personalization rules"""
+    try:
+        await asyncio.to_thread(personalization_service.reload_config)
+    except Exception as e:
+        error_msg = f"Failed to reload personalization rules: {e}"
+        logger.error(error_msg)
+        return [], error_msg
+    
+    logger.info("Reloaded personalization rules config")
+    return ["personalization_rules"], None
+
+
+def _file_stamp(name: str) -> Optional[Tuple[int, int]]:
+    """Modification time and size of a config's file, or None if it can't be read"""
+    try:
+        stat = os.stat(CONFIG_DIR / f"{name}.yaml")
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+async def reload_configs(configs_to_reload: frozenset) -> Tuple[List[str], List[str]]:
+    """
+    Reload the given configs, running independent sources concurrently.
+    
+    Concurrent calls are serialized, and configs whose files haven't changed
+    since their last reload are skipped, so a burst of reloads parses each
+    file at most once.
+    
+    Args:
+        configs_to_reload: Names from RELOADABLE_CONFIGS
+    
+    Returns:
+        Tuple of (reloaded config names, error messages)
+    """
+    async with _reload_lock:
+        stamps = {name: _file_stamp(name) for name in configs_to_reload}
+        pending = frozenset(
+            name for name, stamp in stamps.items()
+            if stamp is None or stamp != _loaded_stamps.get(name)
+        )
+        
+        reloads = []
+        if "calculation_parameters" in pending or "recommendation_rules" in pending:
+            reloads.append(_reload_calculation_configs(pending))
+        if "ai_prompts" in pending:
+            reloads.append(_reload_ai_prompts())
+        if "personalization_rules" in pending:
+            reloads.append(_reload_personalization_rules())
+        
+        done = set(configs_to_reload - pending)
+        errors: List[str] = []
+        for names, error in await asyncio.gather(*reloads):
+            for name in names:
+                done.add(name)
+                if stamps[name] is not None:
+                    _loaded_stamps[name] = stamps[name]
+            if error:
+                errors.append(error)
+    
+    return [name for name in CONFIG_NAMES if name in done], errors
+
+
+# ============================================================================
+# File Watcher
+# ============================================================================
+
+class ConfigWatcher:
+    """Background task that reloads configs when their files change"""
+    
+    def __init__(self, config_dir: Path = CONFIG_DIR, debounce_ms: int = CONFIG_WATCH_DEBOUNCE_MS):
+        self.config_dir = config_dir
+        self.debounce_ms = debounce_ms
+        self._stop_event: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    @property
+    def running(self) -> bool:
+        """Whether the watcher task is active"""
+        return self._task is not None and not self._task.done()
+    
+    def start(self):
+        """Start watching on the running event loop"""
+        if self.running:
+            return
+        self._stop_event = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        """Stop watching"""
+        if not self.running:
+            return
+        self._stop_event.set()
+        await self._task
+        self._task = None
+    
+    async def _run(self):
+        """Reload each batch of changed config files"""
+        try:
+            # Installed with uvicorn[standard]; uses inotify on Linux
+            from watchfiles import awatch
+        except ImportError:
+            logger.warning("watchfiles is not installed; configs reload only via /config/reload")
+            return
+        
+        try:
+            async for changes in awatch(
+                self.config_dir,
+                stop_event=self._stop_event,
+                debounce=self.debounce_ms
+            ):
+                changed = {Path(path).stem for _, path in changes} & RELOADABLE_CONFIGS
+                if not changed:
+                    continue
+                reloaded, errors = await reload_configs(frozenset(changed))
+                logger.info("Reloaded %s after file change", ", ".join(reloaded) or "nothing")
+                for error in errors:
+                    logger.warning("Config file change not applied: %s", error)
+        except Exception as e:
+            logger.exception("Config watcher stopped: %s", e)
+
+
+# ============================================================================
+# Singleton Instance
+# ============================================================================
+
+_config_watcher = ConfigWatcher()
+
+
+def get_config_watcher() -> ConfigWatcher:
+    """Get the global config watcher instance"""
+    return _config_watcher
@@ -3,19 +3,37 @@ Configuration Management Routes
 API endpoints for reloading configuration files without restarting the server.
 """
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, Response, status
 from pydantic import BaseModel
-from typing import List, Optional
-from datetime import datetime
+from typing import List, Optional, Tuple, Dict, Any
+from datetime import datetime, timezone
+import hashlib
 import logging
+import time
+
+import orjson
 
 from ..shared.config_loader import get_config
 from ..shared.ai_service import get_ai_service
 from ..personalization.service import get_personalization_service
+from .reloader import RELOADABLE_CONFIGS, reload_configs
 
 router = APIRouter(prefix="/config", tags=["Configuration"])
 logger = logging.getLogger(__name__)
 
+# Process-wide singletons; bind them once instead of per request. The AI service
+# is still resolved per call: building it creates the LLM provider client, which
+# can fail without an API key and shouldn't happen at import time.
+config_loader = get_config()
+personalization_service = get_personalization_service()
+
+# Dashboards poll /status and /health; reuse the built payload briefly. Cached
+# entries are keyed on the identity of the loaded config dicts, which every
+# reload replaces, so a reload is picked up even within the TTL.
+STATUS_CACHE_TTL_SECONDS = 5.0
+_status_cache: Dict[str, Any] = {"key": None, "value": None, "expires": 0.0}
+_health_cache: Dict[str, Any] = {"key": None, "value": None, "expires": 0.0}
+
 
 # ============================================================================
 # Request/Response Models
@@ -44,6 +62,122 @@ class ConfigStatusResponse(BaseModel):
     last_loaded: Optional[datetime] = None
 
 
+# ============================================================================
+# Status Cache Helpers
+# ============================================================================
+
+def _config_key() -> Optional[Tuple[int, ...]]:
+    """Identify the currently loaded config dicts, or None if any fails to load"""
+    try:
+        return (
+            id(config_loader.calculation_params),
+            id(config_loader.recommendation_rules),
+            id(get_ai_service().config.get_config()),
+            id(personalization_service.config.get_config())
+        )
+    except Exception:
+        return None
+
+
+def _cached(cache: Dict[str, Any], key) -> Optional[Any]:
+    """Return a cached value if it is fresh and was built from the same configs"""
+    if key is not None and cache["key"] == key and time.monotonic() < cache["expires"]:
+        return cache["value"]
+    return None
+
+
+def _store(cache: Dict[str, Any], key, value) -> None:
+    """Cache a value built from the configs identified by key"""
+    cache["key"] = key
+    cache["value"] = value
+    cache["expires"] = time.monotonic() + STATUS_CACHE_TTL_SECONDS
+
+
+def _invalidate_status_caches() -> None:
+    """Force the next /status and /health calls to rebuild their payloads"""
+    _status_cache["expires"] = 0.0
+    _health_cache["expires"] = 0.0
+
+
+# ============================================================================
+# Health Check
+# ============================================================================
+
+def _build_health_status() -> Dict[str, Any]:
+    """Build the /health payload from the currently loaded configs"""
+    try:
+        health_status = {
+            "status": "healthy",
+            "configs": {}
+        }
+        
+        # Check calculation parameters
+        try:
+            calc_config = config_loader.calculation_params
+            health_status["configs"]["calculation_parameters"] = {
+                "loaded": True,
+                "version": calc_config.get("version", "unknown")
+            }
+        except Exception as e:
+            health_status["status"] = "unhealthy"
+            health_status["configs"]["calculation_parameters"] = {
+                "loaded": False,
+                "error": str(e)
+            }
+        
+        # Check recommendation rules
+        try:
+            rec_config = config_loader.recommendation_rules
+            health_status["configs"]["recommendation_rules"] = {
+                "loaded": True,
+                "version": rec_config.get("version", "unknown")
+            }
+        except Exception as e:
+            health_status["status"] = "unhealthy"
+            health_status["configs"]["recommendation_rules"] = {
+                "loaded": False,
+                "error": str(e)
+            }
+        
+        # Check AI prompts
+        try:
+            ai_service = get_ai_service()
+            ai_config = ai_service.config.get_config()
+            health_status["configs"]["ai_prompts"] = {
+                "loaded": True,
+                "version": ai_config.get("version", "unknown")
+            }
+        except Exception as e:
+            health_status["status"] = "unhealthy"
+            health_status["configs"]["ai_prompts"] = {
+                "loaded": False,
+                "error": str(e)
+            }
+        
+        # Check personalization rules
+        try:
+            pers_config = personalization_service.config.get_config()
+            health_status["configs"]["personalization_rules"] = {
+                "loaded": True,
+                "version": pers_config.get("version", "unknown")
+            }
+        except Exception as e:
+            health_status["status"] = "unhealthy"
+            health_status["configs"]["personalization_rules"] = {
+                "loaded": False,
+                "error": str(e)
+            }
+        
+        return health_status
+        
+    except Exception as e:
+        logger.error(f"Configuration health check failed: {e}")
+        return {
+            "status": "unhealthy",
+            "error": str(e)
+        }
+
+
 # ============================================================================
 # Routes
 # ============================================================================
@@ -93,56 +227,18 @@ async def reload_configuration(request: ReloadRequest):
     }
     ```
     """
+    # Determine which configs to reload (a set, so repeated names reload once)
+    configs_to_reload = frozenset(request.configs or RELOADABLE_CONFIGS)
+    unknown = configs_to_reload - RELOADABLE_CONFIGS
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown configs: {', '.join(sorted(unknown))}"
+        )
+    
     try:
-        reloaded = []
-        errors = []
-        
-        # Determine which configs to reload
-        configs_to_reload = request.configs or [
-            "calculation_parameters",
-            "recommendation_rules",
-            "ai_prompts",
-            "personalization_rules"
-        ]
-        
-        # Reload calculation parameters and recommendation rules
-        if "calculation_parameters" in configs_to_reload or "recommendation_rules" in configs_to_reload:
-            try:
-                config_loader = get_config()
-                config_loader.reload()
-                if "calculation_parameters" in configs_to_reload:
-                    reloaded.append("calculation_parameters")
-                if "recommendation_rules" in configs_to_reload:
-                    reloaded.append("recommendation_rules")
-                logger.info("Reloaded calculation and recommendation configs")
-            except Exception as e:
-                error_msg = f"Failed to reload calculation/recommendation configs: {e}"
-                logger.error(error_msg)
-                errors.append(error_msg)
-        
-        # Reload AI prompts
-        if "ai_prompts" in configs_to_reload:
-            try:
-                ai_service = get_ai_service()
-                ai_service.reload_config()
-                reloaded.append("ai_prompts")
-                logger.info("Reloaded AI prompts config")
-            except Exception as e:
-                error_msg = f"Failed to reload AI prompts: {e}"
-                logger.error(error_msg)
-                errors.append(error_msg)
-        
-        # Reload personalization rules
-        if "personalization_rules" in configs_to_reload:
-            try:
-                personalization_service = get_personalization_service()
-                personalization_service.reload_config()
-                reloaded.append("personalization_rules")
-                logger.info("Reloaded personalization rules config")
-            except Exception as e:
-                error_msg = f"Failed to reload personalization rules: {e}"
-                logger.error(error_msg)
-                errors.append(error_msg)
+        reloaded, errors = await reload_configs(configs_to_reload)
+        _invalidate_status_caches()
         
         # Determine success
         success = len(errors) == 0
@@ -152,7 +248,7 @@ async def reload_configuration(request: ReloadRequest):
             success=success,
             message=message,
             reloaded_configs=reloaded,
-            timestamp=datetime.utcnow(),
+            timestamp=datetime.now(timezone.utc),
             errors=errors if errors else None
         )
         
@@ -195,9 +291,13 @@ async def get_configuration_status():
     }
     ```
     """
+    key = _config_key()
+    cached = _cached(_status_cache, key)
+    if cached is not None:
+        return cached.model_copy(update={"last_loaded": datetime.now(timezone.utc)})
+    
     try:
-        # Get config loader
-        config_loader = get_config()
+        # Get calculation and recommendation configs
         calc_config = config_loader.calculation_params
         rec_config = config_loader.recommendation_rules
         
@@ -206,10 +306,9 @@ async def get_configuration_status():
         ai_config = ai_service.config.get_config()
         
         # Get personalization service config
-        personalization_service = get_personalization_service()
         pers_config = personalization_service.config.get_config()
         
-        return ConfigStatusResponse(
+        response = ConfigStatusResponse(
             calculation_parameters={
                 "version": calc_config.get("version", "unknown"),
                 "last_updated": calc_config.get("last_updated", "unknown")
@@ -226,8 +325,10 @@ async def get_configuration_status():
                 "version": pers_config.get("version", "unknown"),
                 "last_updated": pers_config.get("last_updated", "unknown")
             },
-            last_loaded=datetime.utcnow()
+            last_loaded=datetime.now(timezone.utc)
         )
+        _store(_status_cache, key, response)
+        return response
         
     except Exception as e:
         logger.error(f"Error getting configuration status: {e}")
@@ -238,7 +339,7 @@ async def get_configuration_status():
 
 
 @router.get("/health")
-async def config_health_check():
+async def config_health_check(request: Request):
     """
     Check if all configuration files are loaded and valid.
     
@@ -246,77 +347,23 @@ async def config_health_check():
     - Status of each configuration file
     - Any loading errors
     - Configuration versions
+    
+    The response carries an ETag; pollers that send it back in
+    `If-None-Match` get a bodyless 304 while nothing has changed.
     """
-    try:
-        health_status = {
-            "status": "healthy",
-            "configs": {}
-        }
-        
-        # Check calculation parameters
-        try:
-            config_loader = get_config()
-            calc_config = config_loader.calculation_params
-            health_status["configs"]["calculation_parameters"] = {
-                "loaded": True,
-                "version": calc_config.get("version", "unknown")
-            }
-        except Exception as e:
-            health_status["status"] = "unhealthy"
-            health_status["configs"]["calculation_parameters"] = {
-                "loaded": False,
-                "error": str(e)
-            }
-        
-        # Check recommendation rules
-        try:
-            rec_config = config_loader.recommendation_rules
-            health_status["configs"]["recommendation_rules"] = {
-                "loaded": True,
-                "version": rec_config.get("version", "unknown")
-            }
-        except Exception as e:
-            health_status["status"] = "unhealthy"
-            health_status["configs"]["recommendation_rules"] = {
-                "loaded": False,
-                "error": str(e)
-            }
-        
-        # Check AI prompts
-        try:
-            ai_service = get_ai_service()
-            ai_config = ai_service.config.get_config()
-            health_status["configs"]["ai_prompts"] = {
-                "loaded": True,
-                "version": ai_config.get("version", "unknown")
-            }
-        except Exception as e:
-            health_status["status"] = "unhealthy"
-            health_status["configs"]["ai_prompts"] = {
-                "loaded": False,
-                "error": str(e)
-            }
-        
-        # Check personalization rules
-        try:
-            personalization_service = get_personalization_service()
-            pers_config = personalization_service.config.get_config()
-            health_status["configs"]["personalization_rules"] = {
-                "loaded": True,
-                "version": pers_config.get("version", "unknown")
-            }
-        except Exception as e:
-            health_status["status"] = "unhealthy"
-            health_status["configs"]["personalization_rules"] = {
-                "loaded": False,
-                "error": str(e)
-            }
-        
-        return health_status
-        
-    except Exception as e:
-        logger.error(f"Configuration health check failed: {e}")
-        return {
-            "status": "unhealthy",
-            "error": str(e)
-        }
\ No newline at end of file
+    key = _config_key()
+    cached = _cached(_health_cache, key)
+    if cached is None:
+        body = orjson.dumps(_build_health_status())
+        cached = (body, f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"')
+        # A payload built while a config failed to load has no key and is never reused
+        _store(_health_cache, key, cached)
+    
+    body, etag = cached
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": f"max-age={int(STATUS_CACHE_TTL_SECONDS)}"}
+    )
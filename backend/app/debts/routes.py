@@ -1,16 +1,147 @@
-from fastapi import APIRouter, HTTPException, status, Query, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query, UploadFile, File
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from pymongo import ReturnDocument, WriteConcern
+from pymongo.errors import BulkWriteError
 from app.shared.simple_debt_models import SimpleDebt, SimpleDebtUpdate
 from app.shared.database import get_debts_collection
 from app.shared.enums import DebtType
 from bson import ObjectId
-from datetime import datetime, timezone, date
-from typing import Optional, List, Dict, Any
+from datetime import date, datetime, timezone
+from typing import Annotated, Optional, List, Dict, Any, AsyncIterator, Tuple
 from pydantic import ValidationError
 import csv
 import io
+import math
+import orjson
 
 router = APIRouter(prefix="/api/v1/debts", tags=["debts"])
 
+# Fields left out of debt listings, and how many debts each cursor batch fetches
+DEBT_LIST_PROJECTION = {"created_at": 0}
+DEBT_LIST_BATCH_SIZE = 500
+
+# Model fields never written from a request body (built once, not per call)
+CREATE_EXCLUDE = {"id"}
+REPLACE_EXCLUDE = {"id", "created_at"}
+
+# Bulk creates are acknowledged by the primary without waiting for the journal
+MAX_BULK_DEBTS = 1000
+BULK_WRITE_CONCERN = WriteConcern(w=1, j=False)
+
+# Columns every imported CSV must have
+REQUIRED_CSV_FIELDS = frozenset({'type', 'name', 'balance', 'apr', 'minimum_payment', 'next_payment_date'})
+# Optional CSV columns and how to convert their (stripped) values; blank cells are skipped
+OPTIONAL_CSV_FIELDS = (
+    ('lender_name', str),
+    ('actual_monthly_payment', float),
+    ('credit_limit', float),
+    ('late_fees', float),
+    ('original_principal', float),
+    ('term_months', int),
+    ('apr_type', str.lower),
+    ('payment_type', str.lower)
+)
+# CSV imports insert validated rows in batches of this size
+IMPORT_BATCH_SIZE = 500
+# Imported debts above this APR (%) are flagged in the import response
+HIGH_APR_THRESHOLD = 30
+
+DEBT_TYPE_VALUES = frozenset(t.value for t in DebtType)
+DEBT_TYPE_CHOICES = ", ".join(t.value for t in DebtType)
+# Debt types with a fixed amortizing payment, as opposed to revolving credit
+INSTALLMENT_DEBT_TYPES = frozenset({'auto-loan', 'mortgage', 'student-loan', 'personal-loan', 'installment-loan'})
+# Payoff timelines of this many months or more aren't reported (50 years)
+MAX_PAYOFF_MONTHS = 600
+
+def _months_to_payoff(balance: float, monthly_rate: float, payment: float) -> Optional[int]:
+    """
+    Months of fixed payments needed to pay off a balance, or None beyond
+    MAX_PAYOFF_MONTHS. The payment must exceed the first month's interest.
+    """
+    if balance <= 0:
+        return 0
+    if payment <= 0:
+        return None
+    if monthly_rate:
+        # n = -log(1 - rB/P) / log(1 + r)
+        months = -math.log1p(-monthly_rate * balance / payment) / math.log1p(monthly_rate)
+    else:
+        months = balance / payment
+    # Allow for rounding error when the payoff lands exactly on a month
+    months = max(math.ceil(months - 1e-9), 0)
+    return months if months < MAX_PAYOFF_MONTHS else None
+
+def _amortized_payment(balance: float, monthly_rate: float, term: int) -> float:
+    """Fixed monthly payment that pays off a balance over term months"""
+    if monthly_rate == 0:
+        return balance / term
+    # M = P * [r(1+r)^n] / [(1+r)^n - 1]
+    # where M = monthly payment, P = principal, r = monthly rate, n = number of months
+    growth = (1 + monthly_rate) ** term
+    return balance * (monthly_rate * growth / (growth - 1))
+
+async def parse_debt_id(debt_id: str) -> ObjectId:
+    """
+    Convert a debt ID to an ObjectId, rejecting malformed IDs with a 400.
+    
+    Declared async so FastAPI resolves it inline rather than in its threadpool.
+    """
+    if not ObjectId.is_valid(debt_id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid debt ID format"
+        )
+    return ObjectId(debt_id)
+
+# Path dependency resolving {debt_id} to a validated ObjectId
+DebtObjectId = Annotated[ObjectId, Depends(parse_debt_id)]
+
+def _encode_debt(debt: Dict[str, Any]) -> bytes:
+    """Stringify a debt's ObjectId, add its 'id' field, and encode it as JSON"""
+    debt["_id"] = debt["id"] = str(debt["_id"])
+    return orjson.dumps(debt)
+
+async def _iter_debt_list(first_batch: List[Dict[str, Any]], cursor) -> AsyncIterator[Dict[str, Any]]:
+    """Yield an already-fetched first batch, then the rest of the cursor"""
+    for debt in first_batch:
+        yield debt
+    if len(first_batch) == DEBT_LIST_BATCH_SIZE:
+        async for debt in cursor:
+            yield debt
+
+async def _stream_debt_array(debts: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    """Encode debts as a JSON array one debt at a time"""
+    yield b"["
+    separator = b""
+    async for debt in debts:
+        yield separator + _encode_debt(debt)
+        separator = b","
+    yield b"]"
+
+async def _stream_debt_ndjson(debts: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    """Encode debts as newline-delimited JSON"""
+    async for debt in debts:
+        yield _encode_debt(debt) + b"\n"
+
+def _new_debt_document(debt: SimpleDebt, now: datetime) -> Dict[str, Any]:
+    """Convert a debt model to the document stored for a newly created debt"""
+    # Convert debt to dict and remove id if present
+    debt_dict = debt.model_dump(by_alias=True, exclude=CREATE_EXCLUDE, exclude_none=True)
+    
+    debt_dict["created_at"] = debt_dict["updated_at"] = now
+    return debt_dict
+
+def _echo_inserted(debt_dict: Dict[str, Any], inserted_id: ObjectId) -> Dict[str, Any]:
+    """
+    Shape an inserted document the way GET reads it back: string ids and
+    naive UTC datetimes, as MongoDB returns them.
+    """
+    for key, value in debt_dict.items():
+        if isinstance(value, datetime):
+            debt_dict[key] = value.astimezone(timezone.utc).replace(tzinfo=None)
+    debt_dict["_id"] = debt_dict["id"] = str(inserted_id)
+    return debt_dict
+
 @router.post("", status_code=status.HTTP_201_CREATED)
 async def create_debt(debt: SimpleDebt):
     """
@@ -18,74 +149,100 @@ async def create_debt(debt: SimpleDebt):
     """
     collection = get_debts_collection()
     
-    # Convert debt to dict and remove id if present
-    debt_dict = debt.model_dump(by_alias=True, exclude={"id"}, exclude_none=True)
-    
-    # Convert all date fields to datetime for MongoDB compatibility
-    date_fields = ["next_payment_date", "origination_date"]
-    for field in date_fields:
-        if field in debt_dict and isinstance(debt_dict[field], date):
-            debt_dict[field] = datetime.combine(
-                debt_dict[field],
-                datetime.min.time()
-            ).replace(tzinfo=timezone.utc)
-    
-    # Convert all enums to strings
-    enum_fields = ["type", "apr_type", "payment_type", "loan_program"]
-    for field in enum_fields:
-        if field in debt_dict and hasattr(debt_dict[field], "value"):
-            debt_dict[field] = debt_dict[field].value
-    
-    debt_dict["created_at"] = datetime.now(timezone.utc)
-    debt_dict["updated_at"] = datetime.now(timezone.utc)
+    debt_dict = _new_debt_document(debt, datetime.now(timezone.utc))
     
     # Insert into database
     result = await collection.insert_one(debt_dict)
     
-    # Retrieve the created debt
-    created_debt = await collection.find_one({"_id": result.inserted_id})
+    # Echo the inserted document rather than reading it back
+    return ORJSONResponse(_echo_inserted(debt_dict, result.inserted_id), status_code=status.HTTP_201_CREATED)
+
+@router.post("/bulk", status_code=status.HTTP_201_CREATED)
+async def create_debts(debts: List[SimpleDebt]):
+    """
+    Create several debts with a single unordered insert_many.
+    """
+    if not debts:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No debts provided"
+        )
+    if len(debts) > MAX_BULK_DEBTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BULK_DEBTS} debts can be created at once"
+        )
+    
+    collection = get_debts_collection().with_options(write_concern=BULK_WRITE_CONCERN)
     
-    # Convert ObjectId to string for response and add 'id' field
-    created_debt["_id"] = str(created_debt["_id"])
-    created_debt["id"] = created_debt["_id"]
+    now = datetime.now(timezone.utc)
+    debt_dicts = [_new_debt_document(debt, now) for debt in debts]
     
-    return created_debt
+    result = await collection.insert_many(debt_dicts, ordered=False)
+    
+    # Echo the inserted documents rather than reading them back
+    for debt_dict, inserted_id in zip(debt_dicts, result.inserted_ids):
+        _echo_inserted(debt_dict, inserted_id)
+    
+    return ORJSONResponse(debt_dicts, status_code=status.HTTP_201_CREATED)
 
 @router.get("")
-async def get_debts(profile_id: Optional[str] = Query(None, description="Filter debts by profile ID")):
-    """Get all debts, optionally filtered by profile_id."""
+async def get_debts(
+    request: Request,
+    profile_id: Optional[str] = Query(None, description="Filter debts by profile ID"),
+    limit: Optional[int] = Query(None, ge=1, le=DEBT_LIST_BATCH_SIZE, description="Page size; omit to return every matching debt"),
+    after: Optional[str] = Query(None, description="Return debts after this debt ID (the previous page's X-Next-Cursor)")
+):
+    """
+    Get all debts, optionally filtered by profile_id.
+    
+    Debts are streamed as a JSON array as they arrive from the database, or as
+    newline-delimited JSON when the client sends `Accept: application/x-ndjson`.
+    
+    Pass `limit` to page through debts in ID order. A full page carries an
+    `X-Next-Cursor` header; pass its value as `after` to fetch the next page.
+    """
     collection = get_debts_collection()
     
     # Build query filter
     query = {}
     if profile_id:
         query["profile_id"] = profile_id
-    
-    # Find all debts matching the query
-    cursor = collection.find(query)
-    debts = await cursor.to_list(length=None)
-    
-    # Convert ObjectId to string for each debt and add 'id' field
-    for debt in debts:
-        debt["_id"] = str(debt["_id"])
-        debt["id"] = debt["_id"]
-    
-    return debts
+    if after is not None:
+        if not ObjectId.is_valid(after):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        query["_id"] = {"$gt": ObjectId(after)}
+    
+    # Find all debts matching the query; clients never read created_at
+    cursor = collection.find(query, DEBT_LIST_PROJECTION).batch_size(DEBT_LIST_BATCH_SIZE)
+    if limit is not None or after is not None:
+        # Keyset pagination over the (profile_id, _id) index
+        cursor = cursor.sort("_id", 1)
+    if limit is not None:
+        cursor = cursor.limit(limit)
+    
+    # Fetch the first batch up front so query errors still surface as a 500
+    # before any of the body is sent
+    first_batch = await cursor.to_list(length=DEBT_LIST_BATCH_SIZE)
+    
+    # A page fits in the first batch, so its cursor is known before streaming
+    headers = {}
+    if limit is not None and len(first_batch) == limit:
+        headers["X-Next-Cursor"] = str(first_batch[-1]["_id"])
+    
+    debts = _iter_debt_list(first_batch, cursor)
+    if "application/x-ndjson" in request.headers.get("accept", ""):
+        return StreamingResponse(_stream_debt_ndjson(debts), media_type="application/x-ndjson", headers=headers)
+    return StreamingResponse(_stream_debt_array(debts), media_type="application/json", headers=headers)
 
 @router.get("/{debt_id}")
-async def get_debt(debt_id: str):
+async def get_debt(object_id: DebtObjectId):
     """Get a debt by ID."""
     collection = get_debts_collection()
     
-    # Validate ObjectId
-    try:
-        object_id = ObjectId(debt_id)
-    except Exception:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid debt ID format"
-        )
-    
     # Find debt
     debt = await collection.find_one({"_id": object_id})
     
@@ -99,33 +256,16 @@ async def get_debt(debt_id: str):
     debt["_id"] = str(debt["_id"])
     debt["id"] = debt["_id"]
     
-    return debt
+    return ORJSONResponse(debt)
 
 @router.patch("/{debt_id}")
-async def update_debt_partial(debt_id: str, debt_update: SimpleDebtUpdate):
+async def update_debt_partial(object_id: DebtObjectId, debt_update: SimpleDebtUpdate):
     """
     Partially update a debt.
     Only provided fields will be updated, others remain unchanged.
     """
     collection = get_debts_collection()
     
-    # Validate ObjectId
-    try:
-        object_id = ObjectId(debt_id)
-    except Exception:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid debt ID format"
-        )
-    
-    # Check if debt exists
-    existing_debt = await collection.find_one({"_id": object_id})
-    if not existing_debt:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Debt not found"
-        )
-    
     # Prepare update data - only include fields that were provided
     update_dict = debt_update.model_dump(exclude_none=True)
     
@@ -135,108 +275,60 @@ async def update_debt_partial(debt_id: str, debt_update: SimpleDebtUpdate):
             detail="No fields provided for update"
         )
     
-    # Convert all date fields to datetime for MongoDB compatibility
-    date_fields = ["next_payment_date", "origination_date"]
-    for field in date_fields:
-        if field in update_dict and isinstance(update_dict[field], date):
-            update_dict[field] = datetime.combine(
-                update_dict[field],
-                datetime.min.time()
-            ).replace(tzinfo=timezone.utc)
-    
-    # Convert all enums to strings
-    enum_fields = ["type", "apr_type", "payment_type", "loan_program"]
-    for field in enum_fields:
-        if field in update_dict and hasattr(update_dict[field], "value"):
-            update_dict[field] = update_dict[field].value
-    
     update_dict["updated_at"] = datetime.now(timezone.utc)
     
-    # Update debt
-    await collection.update_one(
+    # Check existence, update, and read back the result in one round trip
+    updated_debt = await collection.find_one_and_update(
         {"_id": object_id},
-        {"$set": update_dict}
+        {"$set": update_dict},
+        return_document=ReturnDocument.AFTER
     )
+    if updated_debt is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Debt not found"
+        )
     
-    # Retrieve updated debt
-    updated_debt = await collection.find_one({"_id": object_id})
     updated_debt["_id"] = str(updated_debt["_id"])
     updated_debt["id"] = updated_debt["_id"]
     
-    return updated_debt
+    return ORJSONResponse(updated_debt)
 
 @router.put("/{debt_id}")
-async def update_debt_full(debt_id: str, debt: SimpleDebt):
+async def update_debt_full(object_id: DebtObjectId, debt: SimpleDebt):
     """
     Fully replace a debt (legacy endpoint).
     Use PATCH for partial updates instead.
     """
     collection = get_debts_collection()
     
-    # Validate ObjectId
-    try:
-        object_id = ObjectId(debt_id)
-    except Exception:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid debt ID format"
-        )
-    
-    # Check if debt exists
-    existing_debt = await collection.find_one({"_id": object_id})
-    if not existing_debt:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Debt not found"
-        )
-    
     # Prepare update data
-    update_dict = debt.model_dump(by_alias=True, exclude={"id", "created_at"}, exclude_none=True)
-    
-    # Convert all date fields to datetime for MongoDB compatibility
-    date_fields = ["next_payment_date", "origination_date"]
-    for field in date_fields:
-        if field in update_dict and isinstance(update_dict[field], date):
-            update_dict[field] = datetime.combine(
-                update_dict[field],
-                datetime.min.time()
-            ).replace(tzinfo=timezone.utc)
-    
-    # Convert all enums to strings
-    enum_fields = ["type", "apr_type", "payment_type", "loan_program"]
-    for field in enum_fields:
-        if field in update_dict and hasattr(update_dict[field], "value"):
-            update_dict[field] = update_dict[field].value
+    update_dict = debt.model_dump(by_alias=True, exclude=REPLACE_EXCLUDE, exclude_none=True)
     
     update_dict["updated_at"] = datetime.now(timezone.utc)
     
-    # Update debt
-    await collection.update_one(
+    # Check existence, update, and read back the result in one round trip
+    updated_debt = await collection.find_one_and_update(
         {"_id": object_id},
-        {"$set": update_dict}
+        {"$set": update_dict},
+        return_document=ReturnDocument.AFTER
     )
+    if updated_debt is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Debt not found"
+        )
     
-    # Retrieve updated debt
-    updated_debt = await collection.find_one({"_id": object_id})
     updated_debt["_id"] = str(updated_debt["_id"])
     updated_debt["id"] = updated_debt["_id"]
     
-    return updated_debt
+    return ORJSONResponse(updated_debt)
 
 @router.delete("/{debt_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_debt(debt_id: str):
+async def delete_debt(object_id: DebtObjectId):
     """Delete a debt."""
     collection = get_debts_collection()
     
-    # Validate ObjectId
-    try:
-        object_id = ObjectId(debt_id)
-    except Exception:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid debt ID format"
-        )
-    
     # Delete the debt
     result = await collection.delete_one({"_id": object_id})
     
@@ -248,10 +340,61 @@ async def delete_debt(debt_id: str):
     
     return None
 
+def _parse_csv_date(value: str) -> date:
+    """Parse a YYYY-MM-DD date, using the C ISO parser for zero-padded dates"""
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        # strptime also accepts unpadded months and days (2025-1-5) and
+        # raises the error message reported for the row
+        return datetime.strptime(value, '%Y-%m-%d').date()
+
+async def _insert_import_batch(
+    collection,
+    debt_dicts: List[Dict[str, Any]],
+    rows: List[Tuple[int, Dict[str, str]]],
+    imported_debt_ids: List[str],
+    high_apr_debt_ids: Optional[List[str]],
+    errors: List[Dict[str, Any]]
+):
+    """
+    Insert one batch of imported debts with a single unordered insert_many.
+    
+    Inserted IDs are appended to imported_debt_ids (and to high_apr_debt_ids,
+    unless it is None, when the debt's APR is above HIGH_APR_THRESHOLD); rows
+    that failed to insert are appended to errors.
+    """
+    failed: Dict[int, str] = {}
+    try:
+        await collection.insert_many(debt_dicts, ordered=False)
+    except BulkWriteError as e:
+        # Unordered inserts still write every document that didn't fail
+        failed = {
+            write_error["index"]: write_error.get("errmsg", "Insert failed")
+            for write_error in e.details.get("writeErrors", [])
+        }
+    except Exception as e:
+        failed = {index: str(e) for index in range(len(debt_dicts))}
+    
+    # insert_many assigns each document its _id before sending it
+    for index, (debt_dict, (row_num, row)) in enumerate(zip(debt_dicts, rows)):
+        if index in failed:
+            errors.append({
+                "row": row_num,
+                "error": f"Unexpected error: {failed[index]}",
+                "data": row
+            })
+            continue
+        debt_id = str(debt_dict["_id"])
+        imported_debt_ids.append(debt_id)
+        if high_apr_debt_ids is not None and debt_dict["apr"] > HIGH_APR_THRESHOLD:
+            high_apr_debt_ids.append(debt_id)
+
 @router.post("/import", status_code=status.HTTP_200_OK)
 async def import_debts_from_csv(
     file: UploadFile = File(...),
-    profile_id: str = Query(..., description="Profile ID to associate debts with")
+    profile_id: str = Query(..., description="Profile ID to associate debts with"),
+    warn: bool = Query(True, description="Include warnings (such as high-APR debts) in the response")
 ):
     """
     Import multiple debts from a CSV file.
@@ -264,6 +407,7 @@ async def import_debts_from_csv(
     - error_count: Number of failed imports
     - errors: List of errors with row numbers and details
     - imported_debts: List of successfully imported debt IDs
+    - warnings: High-APR debts, if any (omitted when warn=false)
     """
     # Validate file type
     if not file.filename.endswith('.csv'):
@@ -272,32 +416,30 @@ async def import_debts_from_csv(
             detail="File must be a CSV file"
         )
     
-    # Read file content
+    # Parse CSV straight from the spooled upload, decoding rows as they are read.
+    # Cells beyond the header go under a string key so rows echoed in errors
+    # stay JSON-encodable by orjson
+    csv_reader = csv.DictReader(
+        io.TextIOWrapper(file.file, encoding='utf-8', newline=''),
+        restkey='extra_columns'
+    )
+    
+    # Validate CSV headers
     try:
-        content = await file.read()
-        decoded_content = content.decode('utf-8')
+        fieldnames = csv_reader.fieldnames
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Failed to read CSV file: {str(e)}"
         )
     
-    # Parse CSV
-    csv_reader = csv.DictReader(io.StringIO(decoded_content))
-    
-    # Validate CSV headers
-    required_fields = {'type', 'name', 'balance', 'apr', 'minimum_payment', 'next_payment_date'}
-    optional_fields = {'lender_name', 'is_delinquent', 'actual_monthly_payment', 'credit_limit',
-                      'late_fees', 'original_principal', 'term_months', 'apr_type', 'payment_type'}
-    
-    if not csv_reader.fieldnames:
+    if not fieldnames:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="CSV file is empty or has no headers"
         )
     
-    csv_fields = set(csv_reader.fieldnames)
-    missing_fields = required_fields - csv_fields
+    missing_fields = REQUIRED_CSV_FIELDS.difference(fieldnames)
     
     if missing_fields:
         raise HTTPException(
@@ -307,12 +449,33 @@ async def import_debts_from_csv(
     
     # Process rows
     collection = get_debts_collection()
-    success_count = 0
-    error_count = 0
     errors: List[Dict[str, Any]] = []
     imported_debt_ids: List[str] = []
-    
-    for row_num, row in enumerate(csv_reader, start=2):  # Start at 2 (1 is header)
+    # Only collected when the caller wants warnings
+    high_apr_debt_ids: Optional[List[str]] = [] if warn else None
+    # Every debt from one file is stamped with the same import time
+    imported_at = datetime.now(timezone.utc)
+    # Validated debts waiting to be inserted, with the (row number, row) each came from
+    pending: List[Dict[str, Any]] = []
+    pending_rows: List[Tuple[int, Dict[str, str]]] = []
+    
+    rows = enumerate(csv_reader, start=2)  # Start at 2 (1 is header)
+    row_num = 1
+    while True:
+        # Rows are decoded lazily, so bad bytes surface mid-file; report the
+        # error and keep whatever was imported before it
+        try:
+            row_num, row = next(rows)
+        except StopIteration:
+            break
+        except UnicodeDecodeError as e:
+            errors.append({
+                "row": row_num + 1,
+                "error": f"Failed to read the rest of the CSV file: {str(e)}",
+                "data": {}
+            })
+            break
+        
         try:
             # Clean and prepare data
             debt_data = {
@@ -322,44 +485,23 @@ async def import_debts_from_csv(
                 'balance': float(row['balance']),
                 'apr': float(row['apr']),
                 'minimum_payment': float(row['minimum_payment']),
-                'next_payment_date': datetime.strptime(row['next_payment_date'].strip(), '%Y-%m-%d').date(),
+                'next_payment_date': _parse_csv_date(row['next_payment_date'].strip()),
                 'is_delinquent': row.get('is_delinquent', 'false').strip().lower() == 'true'
             }
             
             # Add optional fields if present
-            if 'lender_name' in row and row['lender_name'].strip():
-                debt_data['lender_name'] = row['lender_name'].strip()
-            
-            if 'actual_monthly_payment' in row and row['actual_monthly_payment'].strip():
-                debt_data['actual_monthly_payment'] = float(row['actual_monthly_payment'])
-            
-            if 'credit_limit' in row and row['credit_limit'].strip():
-                debt_data['credit_limit'] = float(row['credit_limit'])
-            
-            if 'late_fees' in row and row['late_fees'].strip():
-                debt_data['late_fees'] = float(row['late_fees'])
-            
-            if 'original_principal' in row and row['original_principal'].strip():
-                debt_data['original_principal'] = float(row['original_principal'])
-            
-            if 'term_months' in row and row['term_months'].strip():
-                debt_data['term_months'] = int(row['term_months'])
-            
-            if 'apr_type' in row and row['apr_type'].strip():
-                debt_data['apr_type'] = row['apr_type'].strip().lower()
-            
-            if 'payment_type' in row and row['payment_type'].strip():
-                debt_data['payment_type'] = row['payment_type'].strip().lower()
+            for field, convert in OPTIONAL_CSV_FIELDS:
+                value = row.get(field)
+                if value and (value := value.strip()):
+                    debt_data[field] = convert(value)
             
             # Validate debt type
-            try:
-                DebtType(debt_data['type'])
-            except ValueError:
-                raise ValueError(f"Invalid debt type: {debt_data['type']}. Must be one of: {', '.join([t.value for t in DebtType])}")
+            if debt_data['type'] not in DEBT_TYPE_VALUES:
+                raise ValueError(f"Invalid debt type: {debt_data['type']}. Must be one of: {DEBT_TYPE_CHOICES}")
             
             # Create and validate debt model
             try:
-                debt = SimpleDebt(**debt_data)
+                debt = SimpleDebt.model_validate(debt_data)
             except ValidationError as ve:
                 # Extract validation error messages
                 error_messages = []
@@ -370,45 +512,40 @@ async def import_debts_from_csv(
                 raise ValueError('; '.join(error_messages))
             
             # Convert to dict for MongoDB
-            debt_dict = debt.model_dump(by_alias=True, exclude={"id"}, exclude_none=True)
-            
-            # Convert all date fields to datetime for MongoDB compatibility
-            date_fields = ["next_payment_date", "origination_date"]
-            for field in date_fields:
-                if field in debt_dict and isinstance(debt_dict[field], date):
-                    debt_dict[field] = datetime.combine(
-                        debt_dict[field],
-                        datetime.min.time()
-                    ).replace(tzinfo=timezone.utc)
-            
-            # Convert all enums to strings
-            enum_fields = ["type", "apr_type", "payment_type", "loan_program"]
-            for field in enum_fields:
-                if field in debt_dict and hasattr(debt_dict[field], "value"):
-                    debt_dict[field] = debt_dict[field].value
-            
-            debt_dict["created_at"] = datetime.now(timezone.utc)
-            debt_dict["updated_at"] = datetime.now(timezone.utc)
+            debt_dict = _new_debt_document(debt, imported_at)
             
-            # Insert into database
-            result = await collection.insert_one(debt_dict)
-            imported_debt_ids.append(str(result.inserted_id))
-            success_count += 1
+            # Queue for the next batched insert
+            pending.append(debt_dict)
+            pending_rows.append((row_num, row))
             
         except ValueError as ve:
-            error_count += 1
             errors.append({
                 "row": row_num,
                 "error": str(ve),
                 "data": row
             })
         except Exception as e:
-            error_count += 1
             errors.append({
                 "row": row_num,
                 "error": f"Unexpected error: {str(e)}",
                 "data": row
             })
+        
+        if len(pending) >= IMPORT_BATCH_SIZE:
+            await _insert_import_batch(
+                collection, pending, pending_rows, imported_debt_ids, high_apr_debt_ids, errors
+            )
+            pending, pending_rows = [], []
+    
+    if pending:
+        await _insert_import_batch(
+            collection, pending, pending_rows, imported_debt_ids, high_apr_debt_ids, errors
+        )
+    
+    # Insert failures are reported after the batch they belong to; restore row order
+    errors.sort(key=lambda error: error["row"])
+    success_count = len(imported_debt_ids)
+    error_count = len(errors)
     
     # Prepare response
     response = {
@@ -419,33 +556,22 @@ async def import_debts_from_csv(
         "errors": errors
     }
     
-    # Add warnings for high APR
+    # Add warnings for high APR (collected as batches were inserted)
     warnings = []
-    if success_count > 0:
-        # Check for high APR debts
-        high_apr_debts = await collection.find({
-            "_id": {"$in": [ObjectId(id) for id in imported_debt_ids]},
-            "apr": {"$gt": 30}
-        }).to_list(length=None)
-        
-        if high_apr_debts:
-            warnings.append({
-                "type": "high_apr",
-                "message": f"{len(high_apr_debts)} debt(s) have unusually high APR (>30%). Consider refinancing options.",
-                "debt_ids": [str(debt["_id"]) for debt in high_apr_debts]
-            })
+    if high_apr_debt_ids:
+        warnings.append({
+            "type": "high_apr",
+            "message": f"{len(high_apr_debt_ids)} debt(s) have unusually high APR (>{HIGH_APR_THRESHOLD}%). Consider refinancing options.",
+            "debt_ids": high_apr_debt_ids
+        })
     
     if warnings:
         response["warnings"] = warnings
     
     return response
 
-@router.get("/import/template")
-async def download_csv_template():
-    """
-    Download a CSV template for debt import.
-    Returns a CSV file with headers and example data.
-    """
+def _build_csv_template() -> bytes:
+    """Build the CSV import template: headers plus example rows"""
     template_data = [
         {
             "type": "credit-card",
@@ -476,15 +602,25 @@ async def download_csv_template():
     writer.writeheader()
     writer.writerows(template_data)
     
-    csv_content = output.getvalue()
-    
-    from fastapi.responses import Response
+    return output.getvalue().encode("utf-8")
+
+# The template never changes, so it is built once and cached by clients for a day
+CSV_TEMPLATE_BYTES = _build_csv_template()
+CSV_TEMPLATE_HEADERS = {
+    "Content-Disposition": "attachment; filename=debt_import_template.csv",
+    "Cache-Control": "public, max-age=86400"
+}
+
+@router.get("/import/template")
+async def download_csv_template():
+    """
+    Download a CSV template for debt import.
+    Returns a CSV file with headers and example data.
+    """
     return Response(
-        content=csv_content,
+        content=CSV_TEMPLATE_BYTES,
         media_type="text/csv",
-        headers={
-            "Content-Disposition": "attachment; filename=debt_import_template.csv"
-        }
+        headers=CSV_TEMPLATE_HEADERS
     )
 
 @router.post("/validate")
@@ -552,8 +688,7 @@ async def validate_debt(debt_data: Dict[str, Any]):
             monthly_interest = (balance * apr / 100) / 12
             
             # Determine if this is an installment loan
-            installment_types = ['auto-loan', 'mortgage', 'student-loan', 'personal-loan', 'installment-loan']
-            is_installment = debt_type in installment_types
+            is_installment = debt_type in INSTALLMENT_DEBT_TYPES
             
             # Validate minimum payment covers interest (BR-1)
             # For installment loans with a term, use amortization validation
@@ -564,12 +699,7 @@ async def validate_debt(debt_data: Dict[str, Any]):
                     term = int(term_months)
                     monthly_rate = apr / 100 / 12
                     
-                    if monthly_rate == 0:
-                        expected_payment = balance / term
-                    else:
-                        numerator = monthly_rate * ((1 + monthly_rate) ** term)
-                        denominator = ((1 + monthly_rate) ** term) - 1
-                        expected_payment = balance * (numerator / denominator)
+                    expected_payment = _amortized_payment(balance, monthly_rate, term)
                     
                     # Allow some tolerance (within 5% of expected payment)
                     if minimum_payment < expected_payment * 0.95:
@@ -644,20 +774,10 @@ async def validate_debt(debt_data: Dict[str, Any]):
                 except (ValueError, TypeError):
                     pass
             elif minimum_payment > monthly_interest:
-                # For credit cards and loans without terms, calculate iteratively
-                remaining_balance = balance
-                months = 0
-                max_months = 600  # 50 years safety limit
-                
-                while remaining_balance > 0 and months < max_months:
-                    interest = (remaining_balance * apr / 100) / 12
-                    principal = minimum_payment - interest
-                    if principal <= 0:
-                        break
-                    remaining_balance -= principal
-                    months += 1
+                # For credit cards and loans without terms, solve the amortization directly
+                months = _months_to_payoff(balance, apr / 100 / 12, minimum_payment)
                 
-                if months < max_months and remaining_balance <= 0:
+                if months is not None:
                     years = months / 12
                     total_interest = (minimum_payment * months) - balance
                     
@@ -727,13 +847,10 @@ async def suggest_minimum_payment(debt_data: Dict[str, Any]):
         monthly_interest = balance * monthly_rate
         
         # Determine if this is an installment loan (fixed payment) or revolving credit
-        installment_types = ['auto-loan', 'mortgage', 'student-loan', 'personal-loan', 'installment-loan']
-        is_installment = debt_type in installment_types
+        is_installment = debt_type in INSTALLMENT_DEBT_TYPES
         
         if is_installment and term_months:
             # Use amortization formula for installment loans
-            # M = P * [r(1+r)^n] / [(1+r)^n - 1]
-            # where M = monthly payment, P = principal, r = monthly rate, n = number of months
             try:
                 term = int(term_months)
                 if term <= 0:
@@ -745,9 +862,7 @@ async def suggest_minimum_payment(debt_data: Dict[str, Any]):
                     reasoning = f"With 0% APR, payment is simply ${balance:.2f} ÷ {term} months = ${suggested_minimum:.2f}/month."
                 else:
                     # Standard amortization formula
-                    numerator = monthly_rate * ((1 + monthly_rate) ** term)
-                    denominator = ((1 + monthly_rate) ** term) - 1
-                    suggested_minimum = balance * (numerator / denominator)
+                    suggested_minimum = _amortized_payment(balance, monthly_rate, term)
                     
                     reasoning = (
                         f"For a {term}-month {debt_type.replace('-', ' ')} at {apr}% APR, "
@@ -780,9 +895,7 @@ async def suggest_minimum_payment(debt_data: Dict[str, Any]):
                     f"${balance:.2f} ÷ {estimated_term} months = ${suggested_minimum:.2f}/month."
                 )
             else:
-                numerator = monthly_rate * ((1 + monthly_rate) ** estimated_term)
-                denominator = ((1 + monthly_rate) ** estimated_term) - 1
-                suggested_minimum = balance * (numerator / denominator)
+                suggested_minimum = _amortized_payment(balance, monthly_rate, estimated_term)
                 reasoning = (
                     f"For a {debt_type.replace('-', ' ')} at {apr}% APR with no term specified, "
                     f"we estimate a 5-year payoff: ${suggested_minimum:.2f}/month. "
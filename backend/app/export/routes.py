@@ -4,10 +4,14 @@ API endpoints for exporting data to various formats.
 """
 from fastapi import APIRouter, HTTPException, status, Response
 from fastapi.responses import StreamingResponse
+import asyncio
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 import logging
 import io
+from typing import Dict, Any, AsyncIterator, List
+
+import orjson
 
 from .models import (
     JSONExportRequest,
@@ -15,12 +19,46 @@ from .models import (
     PDFExportRequest,
     ExportResponse
 )
-from .service import get_export_service
+from .service import DEBT_CSV_FIELDS, get_export_service
 from ..shared.database import get_database
 
 router = APIRouter(prefix="/export", tags=["Export"])
 logger = logging.getLogger(__name__)
 
+# Each export reads only the fields it writes out; _id is never exported
+EXPORT_DOCUMENT_PROJECTION = {"_id": 0}
+DEBT_CSV_PROJECTION = {"_id": 0, **dict.fromkeys(DEBT_CSV_FIELDS, 1)}
+PDF_PROFILE_PROJECTION = {"_id": 0, "name": 1, "monthly_income": 1, "goal": 1}
+# Debts fetched before the CSV response starts; the rest stream from the cursor
+CSV_DEBT_BATCH_SIZE = 500
+
+
+async def _iter_cursor(first_batch: List[Dict[str, Any]], cursor) -> AsyncIterator[Dict[str, Any]]:
+    """Yield an already-fetched first batch, then the rest of the cursor"""
+    for document in first_batch:
+        yield document
+    if len(first_batch) == CSV_DEBT_BATCH_SIZE:
+        async for document in cursor:
+            yield document
+
+
+def _pdf_debt_pipeline(profile_id: str) -> List[Dict[str, Any]]:
+    """Collect the debt fields the PDF report prints, and their totals, in one result"""
+    return [
+        {"$match": {"profile_id": profile_id}},
+        {"$group": {
+            "_id": None,
+            "total_balance": {"$sum": "$balance"},
+            "total_minimum": {"$sum": "$minimum_payment"},
+            "debts": {"$push": {
+                "name": "$name",
+                "balance": "$balance",
+                "apr": "$apr",
+                "minimum_payment": "$minimum_payment"
+            }}
+        }}
+    ]
+
 
 # ============================================================================
 # Export Endpoints
@@ -66,22 +104,16 @@ async def export_to_json(request: JSONExportRequest):
     try:
         db = await get_database()
         export_service = get_export_service()
+        # One timestamp for the export's metadata, filename and response
+        now = datetime.now(timezone.utc)
         
-        # Fetch profile data
-        profile_data = None
-        if request.include_profile:
-            profile = await db.profiles.find_one({"profile_id": request.profile_id})
-            if profile:
-                profile.pop("_id", None)
-                profile_data = profile
-        
-        # Fetch debts data
-        debts_data = []
-        if request.include_debts:
-            debts_cursor = db.debts.find({"profile_id": request.profile_id})
-            async for debt in debts_cursor:
-                debt.pop("_id", None)
-                debts_data.append(debt)
+        # Fetch profile and debts data concurrently; parts left out resolve empty
+        profile_data, debts_data = await asyncio.gather(
+            db.profiles.find_one({"profile_id": request.profile_id}, EXPORT_DOCUMENT_PROJECTION)
+            if request.include_profile else asyncio.sleep(0, result=None),
+            db.debts.find({"profile_id": request.profile_id}, EXPORT_DOCUMENT_PROJECTION).to_list(length=None)
+            if request.include_debts else asyncio.sleep(0, result=[])
+        )
         
         # Fetch scenarios data (placeholder - scenarios not yet stored in DB)
         scenarios_data = []
@@ -89,28 +121,32 @@ async def export_to_json(request: JSONExportRequest):
             # TODO: Implement scenario storage and retrieval
             pass
         
-        # Export to JSON
-        json_str, size_bytes = await export_service.export_to_json(
+        # Export to JSON; the export document is embedded as-is
+        data, size_bytes = await export_service.export_to_json(
             profile_data=profile_data,
             debts_data=debts_data,
             scenarios_data=scenarios_data,
-            pretty_print=request.pretty_print
+            pretty_print=request.pretty_print,
+            now=now
         )
         
-        # Parse JSON for inline data
-        import json
-        data = json.loads(json_str)
-        
         export_id = str(uuid.uuid4())
         
-        return ExportResponse(
-            success=True,
-            message="Data exported successfully to JSON",
-            export_id=export_id,
-            format="json",
-            file_size_bytes=size_bytes,
-            created_at=datetime.utcnow(),
-            data=data
+        # Encode the ExportResponse body with orjson directly; re-validating
+        # the export document through the model would only copy it
+        body = {
+            "success": True,
+            "message": "Data exported successfully to JSON",
+            "export_id": export_id,
+            "format": "json",
+            "file_size_bytes": size_bytes,
+            "created_at": now,
+            "download_url": None,
+            "data": data
+        }
+        return Response(
+            content=orjson.dumps(body, default=str, option=orjson.OPT_NAIVE_UTC),
+            media_type="application/json"
         )
         
     except Exception as e:
@@ -154,26 +190,26 @@ async def export_to_csv(request: CSVExportRequest):
     try:
         db = await get_database()
         export_service = get_export_service()
+        # One timestamp for the export's metadata, filename and response
+        now = datetime.now(timezone.utc)
         
-        csv_str = ""
-        filename = f"export_{request.export_type}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.csv"
+        filename = f"export_{request.export_type}_{now.strftime('%Y%m%d_%H%M%S')}.csv"
         
         if request.export_type == "debts":
-            # Fetch debts data
-            debts_data = []
-            debts_cursor = db.debts.find({"profile_id": request.profile_id})
-            async for debt in debts_cursor:
-                debt.pop("_id", None)
-                debts_data.append(debt)
-            
-            csv_str, _ = await export_service.export_debts_to_csv(debts_data)
+            # Fetch the first batch up front so query errors still surface as a
+            # 500 before any of the body is sent, then encode the rest as it arrives
+            debts_cursor = db.debts.find(
+                {"profile_id": request.profile_id}, DEBT_CSV_PROJECTION
+            ).batch_size(CSV_DEBT_BATCH_SIZE)
+            first_batch = await debts_cursor.to_list(length=CSV_DEBT_BATCH_SIZE)
+            csv_chunks = export_service.export_debts_to_csv(_iter_cursor(first_batch, debts_cursor))
             
         elif request.export_type == "scenarios":
             # Fetch scenarios data (placeholder)
             scenarios_data = []
             # TODO: Implement scenario storage and retrieval
             
-            csv_str, _ = await export_service.export_scenarios_to_csv(scenarios_data)
+            csv_chunks = export_service.export_scenarios_to_csv(scenarios_data)
             
         elif request.export_type == "payments":
             if not request.scenario_id:
@@ -186,11 +222,11 @@ async def export_to_csv(request: CSVExportRequest):
             scenario_data = {}
             # TODO: Implement scenario storage and retrieval
             
-            csv_str, _ = await export_service.export_payment_schedule_to_csv(scenario_data)
+            csv_chunks = export_service.export_payment_schedule_to_csv(scenario_data)
         
-        # Return CSV as downloadable file
-        return Response(
-            content=csv_str,
+        # Stream CSV as a downloadable file
+        return StreamingResponse(
+            csv_chunks,
             media_type="text/csv",
             headers={
                 "Content-Disposition": f"attachment; filename={filename}"
@@ -228,29 +264,27 @@ async def export_to_pdf(request: PDFExportRequest):
     
     **Response:**
     Returns a PDF file as a downloadable attachment.
-    
-    **Note:** This is a basic implementation. For production, consider using
-    libraries like reportlab or weasyprint for professional PDF generation.
     """
     try:
         db = await get_database()
         export_service = get_export_service()
+        # One timestamp for the export's metadata, filename and response
+        now = datetime.now(timezone.utc)
         
-        # Fetch profile data
-        profile_data = None
-        if request.include_profile:
-            profile = await db.profiles.find_one({"profile_id": request.profile_id})
-            if profile:
-                profile.pop("_id", None)
-                profile_data = profile
+        # Fetch profile and debts data concurrently; MongoDB sums the debt
+        # totals while collecting the debts
+        profile_data, summaries = await asyncio.gather(
+            db.profiles.find_one({"profile_id": request.profile_id}, PDF_PROFILE_PROJECTION)
+            if request.include_profile else asyncio.sleep(0, result=None),
+            db.debts.aggregate(_pdf_debt_pipeline(request.profile_id)).to_list(length=1)
+            if request.include_debts else asyncio.sleep(0, result=[])
+        )
         
-        # Fetch debts data
         debts_data = []
-        if request.include_debts:
-            debts_cursor = db.debts.find({"profile_id": request.profile_id})
-            async for debt in debts_cursor:
-                debt.pop("_id", None)
-                debts_data.append(debt)
+        debt_totals = None
+        if summaries:
+            debts_data = summaries[0]["debts"]
+            debt_totals = (summaries[0]["total_balance"], summaries[0]["total_minimum"])
         
         # Fetch scenarios data (placeholder)
         scenarios_data = []
@@ -265,10 +299,12 @@ async def export_to_pdf(request: PDFExportRequest):
             scenarios_data=scenarios_data,
             report_type=request.report_type,
             scenario_id=request.scenario_id,
-            include_charts=request.include_charts
+            include_charts=request.include_charts,
+            now=now,
+            debt_totals=debt_totals
         )
         
-        filename = f"debt_report_{request.report_type}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.pdf"
+        filename = f"debt_report_{request.report_type}_{now.strftime('%Y%m%d_%H%M%S')}.pdf"
         
         # Return PDF as downloadable file
         return Response(
@@ -2,16 +2,95 @@
 Export Service
 Business logic for exporting data to various formats.
 """
-import json
+import asyncio
 import csv
 import io
 import uuid
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple, Iterable, AsyncIterable, AsyncIterator
+from datetime import datetime, timezone
 import logging
 
+import orjson
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import Flowable, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+from xml.sax.saxutils import escape
+
 logger = logging.getLogger(__name__)
 
+# CSV exports are sent in chunks of up to this many lines
+CSV_CHUNK_ROWS = 500
+
+# CSV export columns, in order; rows are built as tuples matching them
+DEBT_CSV_FIELDS = ("debt_id", "name", "type", "balance", "apr", "minimum_payment", "status", "created_at")
+SCENARIO_CSV_FIELDS = (
+    "scenario_id", "name", "strategy", "monthly_payment", "total_months",
+    "total_interest", "total_paid", "payoff_date", "created_at"
+)
+PAYMENT_CSV_FIELDS = ("month", "payment_date", "debt_name", "payment", "principal", "interest", "remaining_balance")
+
+
+class _LineEcho:
+    """Stand-in file for csv writers: write() returns each line instead of storing it"""
+    
+    def write(self, line: str) -> str:
+        return line
+
+
+async def _aiter(items: Iterable[Any]) -> AsyncIterator[Any]:
+    """Iterate a list in an async for loop"""
+    for item in items:
+        yield item
+
+
+# PDF styles are built once; getSampleStyleSheet() creates new style objects per call
+_STYLES = getSampleStyleSheet()
+_TABLE_STYLE = TableStyle([
+    ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#1f2937")),
+    ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("ALIGN", (1, 0), (-1, -1), "RIGHT"),
+    ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#f3f4f6")]),
+    ("GRID", (0, 0), (-1, -1), 0.25, colors.grey)
+])
+
+
+def _render_pdf(flowables: List[Flowable]) -> bytes:
+    """Lay out report flowables as a letter-size PDF"""
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, title="Debt PathFinder Report")
+    doc.build(flowables)
+    return buffer.getvalue()
+
+
+async def _stream_csv(
+    fieldnames: Tuple[str, ...],
+    rows: AsyncIterable[tuple]
+) -> AsyncIterator[str]:
+    """
+    Encode rows as CSV text, yielded in chunks of up to CSV_CHUNK_ROWS lines.
+    
+    Rows are tuples in fieldnames order. The header is written before the
+    first row, so no rows yields nothing.
+    """
+    writer = csv.writer(_LineEcho())
+    lines: Optional[List[str]] = None
+    try:
+        async for row in rows:
+            if lines is None:
+                lines = [writer.writerow(fieldnames)]
+            lines.append(writer.writerow(row))
+            if len(lines) >= CSV_CHUNK_ROWS:
+                yield "".join(lines)
+                lines = []
+    except Exception as e:
+        logger.error(f"Error exporting to CSV: {e}")
+        raise
+    
+    if lines:
+        yield "".join(lines)
+
 
 class ExportService:
     """Service for handling data exports"""
@@ -25,25 +104,30 @@ class ExportService:
         profile_data: Optional[Dict[str, Any]],
         debts_data: List[Dict[str, Any]],
         scenarios_data: List[Dict[str, Any]],
-        pretty_print: bool = True
-    ) -> tuple[str, int]:
+        pretty_print: bool = True,
+        now: Optional[datetime] = None
+    ) -> tuple[Dict[str, Any], int]:
         """
         Export data to JSON format.
         
+        The export document is returned as a dict so callers can embed it
+        without parsing it back; the size is that of its orjson encoding.
+        
         Args:
             profile_data: Profile information
             debts_data: List of debts
             scenarios_data: List of scenarios
             pretty_print: Whether to format JSON with indentation
+            now: Export time (UTC); defaults to the current time
             
         Returns:
-            Tuple of (json_string, size_in_bytes)
+            Tuple of (export_data, size_in_bytes)
         """
         try:
             export_data = {
                 "export_metadata": {
                     "export_id": str(uuid.uuid4()),
-                    "exported_at": datetime.utcnow().isoformat(),
+                    "exported_at": (now or datetime.now(timezone.utc)).isoformat(),
                     "format": "json",
                     "version": "1.0"
                 },
@@ -52,79 +136,50 @@ class ExportService:
                 "scenarios": scenarios_data
             }
             
+            # MongoDB returns naive datetimes in UTC
+            option = orjson.OPT_NAIVE_UTC
             if pretty_print:
-                json_str = json.dumps(export_data, indent=2, default=str)
-            else:
-                json_str = json.dumps(export_data, default=str)
+                option |= orjson.OPT_INDENT_2
+            size_bytes = len(orjson.dumps(export_data, default=str, option=option))
             
-            size_bytes = len(json_str.encode('utf-8'))
-            
-            return json_str, size_bytes
+            return export_data, size_bytes
             
         except Exception as e:
             logger.error(f"Error exporting to JSON: {e}")
             raise
     
-    async def export_debts_to_csv(
+    def export_debts_to_csv(
         self,
-        debts_data: List[Dict[str, Any]]
-    ) -> tuple[str, int]:
+        debts: AsyncIterable[Dict[str, Any]]
+    ) -> AsyncIterator[str]:
         """
-        Export debts to CSV format.
+        Export debts to CSV format, encoding rows as debts arrive.
         
         Args:
-            debts_data: List of debts
+            debts: Debts to export, such as a database cursor
             
         Returns:
-            Tuple of (csv_string, size_in_bytes)
+            Async iterator of CSV text chunks
         """
-        try:
-            output = io.StringIO()
-            
-            if not debts_data:
-                return "", 0
-            
-            # Define CSV columns
-            fieldnames = [
-                "debt_id",
-                "name",
-                "type",
-                "balance",
-                "apr",
-                "minimum_payment",
-                "status",
-                "created_at"
-            ]
-            
-            writer = csv.DictWriter(output, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for debt in debts_data:
-                row = {
-                    "debt_id": debt.get("debt_id", ""),
-                    "name": debt.get("name", ""),
-                    "type": debt.get("type", ""),
-                    "balance": debt.get("balance", 0),
-                    "apr": debt.get("apr", 0),
-                    "minimum_payment": debt.get("minimum_payment", 0),
-                    "status": debt.get("status", "active"),
-                    "created_at": debt.get("created_at", "")
-                }
-                writer.writerow(row)
-            
-            csv_str = output.getvalue()
-            size_bytes = len(csv_str.encode('utf-8'))
-            
-            return csv_str, size_bytes
-            
-        except Exception as e:
-            logger.error(f"Error exporting debts to CSV: {e}")
-            raise
+        rows = (
+            (
+                debt.get("debt_id", ""),
+                debt.get("name", ""),
+                debt.get("type", ""),
+                debt.get("balance", 0),
+                debt.get("apr", 0),
+                debt.get("minimum_payment", 0),
+                debt.get("status", "active"),
+                debt.get("created_at", "")
+            )
+            async for debt in debts
+        )
+        return _stream_csv(DEBT_CSV_FIELDS, rows)
     
-    async def export_scenarios_to_csv(
+    def export_scenarios_to_csv(
         self,
         scenarios_data: List[Dict[str, Any]]
-    ) -> tuple[str, int]:
+    ) -> AsyncIterator[str]:
         """
         Export scenarios to CSV format.
         
@@ -132,57 +187,28 @@ class ExportService:
             scenarios_data: List of scenarios
             
         Returns:
-            Tuple of (csv_string, size_in_bytes)
+            Async iterator of CSV text chunks
         """
-        try:
-            output = io.StringIO()
-            
-            if not scenarios_data:
-                return "", 0
-            
-            # Define CSV columns
-            fieldnames = [
-                "scenario_id",
-                "name",
-                "strategy",
-                "monthly_payment",
-                "total_months",
-                "total_interest",
-                "total_paid",
-                "payoff_date",
-                "created_at"
-            ]
-            
-            writer = csv.DictWriter(output, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for scenario in scenarios_data:
-                row = {
-                    "scenario_id": scenario.get("scenario_id", ""),
-                    "name": scenario.get("name", ""),
-                    "strategy": scenario.get("strategy", ""),
-                    "monthly_payment": scenario.get("monthly_payment", 0),
-                    "total_months": scenario.get("total_months", 0),
-                    "total_interest": scenario.get("total_interest", 0),
-                    "total_paid": scenario.get("total_paid", 0),
-                    "payoff_date": scenario.get("payoff_date", ""),
-                    "created_at": scenario.get("created_at", "")
-                }
-                writer.writerow(row)
-            
-            csv_str = output.getvalue()
-            size_bytes = len(csv_str.encode('utf-8'))
-            
-            return csv_str, size_bytes
-            
-        except Exception as e:
-            logger.error(f"Error exporting scenarios to CSV: {e}")
-            raise
+        rows = (
+            (
+                scenario.get("scenario_id", ""),
+                scenario.get("name", ""),
+                scenario.get("strategy", ""),
+                scenario.get("monthly_payment", 0),
+                scenario.get("total_months", 0),
+                scenario.get("total_interest", 0),
+                scenario.get("total_paid", 0),
+                scenario.get("payoff_date", ""),
+                scenario.get("created_at", "")
+            )
+            async for scenario in _aiter(scenarios_data)
+        )
+        return _stream_csv(SCENARIO_CSV_FIELDS, rows)
     
-    async def export_payment_schedule_to_csv(
+    def export_payment_schedule_to_csv(
         self,
         scenario_data: Dict[str, Any]
-    ) -> tuple[str, int]:
+    ) -> AsyncIterator[str]:
         """
         Export payment schedule from a scenario to CSV format.
         
@@ -190,49 +216,21 @@ class ExportService:
             scenario_data: Scenario with payment schedule
             
         Returns:
-            Tuple of (csv_string, size_in_bytes)
+            Async iterator of CSV text chunks
         """
-        try:
-            output = io.StringIO()
-            
-            schedule = scenario_data.get("schedule", [])
-            if not schedule:
-                return "", 0
-            
-            # Define CSV columns
-            fieldnames = [
-                "month",
-                "payment_date",
-                "debt_name",
-                "payment",
-                "principal",
-                "interest",
-                "remaining_balance"
-            ]
-            
-            writer = csv.DictWriter(output, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for payment in schedule:
-                row = {
-                    "month": payment.get("month", 0),
-                    "payment_date": payment.get("payment_date", ""),
-                    "debt_name": payment.get("debt_name", ""),
-                    "payment": payment.get("payment", 0),
-                    "principal": payment.get("principal", 0),
-                    "interest": payment.get("interest", 0),
-                    "remaining_balance": payment.get("remaining_balance", 0)
-                }
-                writer.writerow(row)
-            
-            csv_str = output.getvalue()
-            size_bytes = len(csv_str.encode('utf-8'))
-            
-            return csv_str, size_bytes
-            
-        except Exception as e:
-            logger.error(f"Error exporting payment schedule to CSV: {e}")
-            raise
+        rows = (
+            (
+                payment.get("month", 0),
+                payment.get("payment_date", ""),
+                payment.get("debt_name", ""),
+                payment.get("payment", 0),
+                payment.get("principal", 0),
+                payment.get("interest", 0),
+                payment.get("remaining_balance", 0)
+            )
+            async for payment in _aiter(scenario_data.get("schedule", []))
+        )
+        return _stream_csv(PAYMENT_CSV_FIELDS, rows)
     
     async def export_to_pdf(
         self,
@@ -241,13 +239,15 @@ class ExportService:
         scenarios_data: List[Dict[str, Any]],
         report_type: str = "summary",
         scenario_id: Optional[str] = None,
-        include_charts: bool = True
+        include_charts: bool = True,
+        now: Optional[datetime] = None,
+        debt_totals: Optional[Tuple[float, float]] = None
     ) -> tuple[bytes, int]:
         """
         Export data to PDF format.
         
-        Note: This is a placeholder implementation. Full PDF generation
-        requires additional libraries like reportlab or weasyprint.
+        Builds a reportlab document with the profile, a debt table, and a
+        scenario table.
         
         Args:
             profile_data: Profile information
@@ -256,86 +256,80 @@ class ExportService:
             report_type: Type of report (summary, detailed, action_plan)
             scenario_id: Specific scenario to include
             include_charts: Whether to include charts
+            now: Report time (UTC); defaults to the current time
+            debt_totals: Precomputed (total balance, total minimum payment);
+                summed from debts_data when not given
             
         Returns:
             Tuple of (pdf_bytes, size_in_bytes)
         """
         try:
-            # Placeholder: Generate a simple text-based PDF content
-            # In production, use reportlab or weasyprint for proper PDF generation
-            
-            content = f"""
-Debt PathFinder Report
-Generated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}
-Report Type: {report_type}
-
-{'='*60}
-
-PROFILE INFORMATION
-{'='*60}
-"""
+            generated_at = (now or datetime.now(timezone.utc)).strftime('%Y-%m-%d %H:%M:%S UTC')
+            flowables = [
+                Paragraph("Debt PathFinder Report", _STYLES["Title"]),
+                Paragraph(f"Generated: {generated_at}", _STYLES["Normal"]),
+                Paragraph(f"Report Type: {escape(report_type)}", _STYLES["Normal"]),
+                Paragraph("Profile Information", _STYLES["Heading2"])
+            ]
             
-            if profile_data:
-                content += f"""
-Name: {profile_data.get('name', 'N/A')}
-Monthly Income: ${profile_data.get('monthly_income', 0):,.2f}
-Goal: {profile_data.get('goal', 'N/A')}
-"""
+            if profile_data is not None:
+                flowables += [
+                    Paragraph(f"Name: {escape(str(profile_data.get('name', 'N/A')))}", _STYLES["Normal"]),
+                    Paragraph(f"Monthly Income: ${profile_data.get('monthly_income', 0):,.2f}", _STYLES["Normal"]),
+                    Paragraph(f"Goal: {escape(str(profile_data.get('goal', 'N/A')))}", _STYLES["Normal"])
+                ]
             
-            content += f"""
-
-{'='*60}
-DEBT SUMMARY
-{'='*60}
-
-Total Debts: {len(debts_data)}
-"""
+            flowables += [
+                Paragraph("Debt Summary", _STYLES["Heading2"]),
+                Paragraph(f"Total Debts: {len(debts_data)}", _STYLES["Normal"])
+            ]
             
             if debts_data:
-                total_balance = sum(d.get('balance', 0) for d in debts_data)
-                total_minimum = sum(d.get('minimum_payment', 0) for d in debts_data)
+                if debt_totals is not None:
+                    total_balance, total_minimum = debt_totals
+                else:
+                    total_balance = sum(d.get('balance', 0) for d in debts_data)
+                    total_minimum = sum(d.get('minimum_payment', 0) for d in debts_data)
                 
-                content += f"""
-Total Balance: ${total_balance:,.2f}
-Total Minimum Payment: ${total_minimum:,.2f}
-
-Debts:
-"""
-                for debt in debts_data:
-                    content += f"""
-  - {debt.get('name', 'Unknown')}
-    Balance: ${debt.get('balance', 0):,.2f}
-    APR: {debt.get('apr', 0):.2f}%
-    Minimum Payment: ${debt.get('minimum_payment', 0):,.2f}
-"""
+                # Table cells are plain text, so names need no escaping
+                debt_rows = [("Debt", "Balance", "APR", "Minimum Payment")]
+                debt_rows += [
+                    (
+                        str(debt.get('name', 'Unknown')),
+                        f"${debt.get('balance', 0):,.2f}",
+                        f"{debt.get('apr', 0):.2f}%",
+                        f"${debt.get('minimum_payment', 0):,.2f}"
+                    )
+                    for debt in debts_data
+                ]
+                flowables += [
+                    Paragraph(f"Total Balance: ${total_balance:,.2f}", _STYLES["Normal"]),
+                    Paragraph(f"Total Minimum Payment: ${total_minimum:,.2f}", _STYLES["Normal"]),
+                    Spacer(1, 12),
+                    Table(debt_rows, style=_TABLE_STYLE, repeatRows=1)
+                ]
             
             if scenarios_data:
-                content += f"""
-
-{'='*60}
-SCENARIOS
-{'='*60}
-
-Total Scenarios: {len(scenarios_data)}
-"""
-                for scenario in scenarios_data:
-                    content += f"""
-  - {scenario.get('name', 'Unknown')}
-    Strategy: {scenario.get('strategy', 'N/A')}
-    Monthly Payment: ${scenario.get('monthly_payment', 0):,.2f}
-    Payoff Time: {scenario.get('total_months', 0)} months
-    Total Interest: ${scenario.get('total_interest', 0):,.2f}
-"""
-            
-            content += f"""
-
-{'='*60}
-End of Report
-{'='*60}
-"""
-            
-            # Convert to bytes (in production, this would be actual PDF bytes)
-            pdf_bytes = content.encode('utf-8')
+                scenario_rows = [("Scenario", "Strategy", "Monthly Payment", "Payoff Time", "Total Interest")]
+                scenario_rows += [
+                    (
+                        str(scenario.get('name', 'Unknown')),
+                        str(scenario.get('strategy', 'N/A')),
+                        f"${scenario.get('monthly_payment', 0):,.2f}",
+                        f"{scenario.get('total_months', 0)} months",
+                        f"${scenario.get('total_interest', 0):,.2f}"
+                    )
+                    for scenario in scenarios_data
+                ]
+                flowables += [
+                    Paragraph("Scenarios", _STYLES["Heading2"]),
+                    Paragraph(f"Total Scenarios: {len(scenarios_data)}", _STYLES["Normal"]),
+                    Spacer(1, 12),
+                    Table(scenario_rows, style=_TABLE_STYLE, repeatRows=1)
+                ]
+            
+            # Layout is CPU-bound; keep it off the event loop
+            pdf_bytes = await asyncio.to_thread(_render_pdf, flowables)
             size_bytes = len(pdf_bytes)
             
             return pdf_bytes, size_bytes
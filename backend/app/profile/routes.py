@@ -1,12 +1,28 @@
-from fastapi import APIRouter, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from app.shared.models import Profile, ProfileUpdate
 from app.shared.database import get_profiles_collection
 from bson import ObjectId
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Annotated, Optional
 
 router = APIRouter(prefix="/api/v1/profiles", tags=["profiles"])
 
+async def parse_profile_id(profile_id: str) -> ObjectId:
+    """
+    Convert a profile ID to an ObjectId, rejecting malformed IDs with a 400.
+    
+    Declared async so FastAPI resolves it inline rather than in its threadpool.
+    """
+    if not ObjectId.is_valid(profile_id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid profile ID format"
+        )
+    return ObjectId(profile_id)
+
+# Path dependency resolving {profile_id} to a validated ObjectId
+ProfileObjectId = Annotated[ObjectId, Depends(parse_profile_id)]
+
 @router.post("", status_code=status.HTTP_201_CREATED)
 async def create_profile(profile: Profile):
     """
@@ -68,19 +84,10 @@ async def get_profile_by_user_id(user_id: str):
     return profile
 
 @router.get("/{profile_id}")
-async def get_profile(profile_id: str):
+async def get_profile(object_id: ProfileObjectId):
     """Get a user profile by profile ID."""
     collection = get_profiles_collection()
     
-    # Validate ObjectId
-    try:
-        object_id = ObjectId(profile_id)
-    except Exception:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid profile ID format"
-        )
-    
     # Find profile
     profile = await collection.find_one({"_id": object_id})
     
@@ -97,22 +104,13 @@ async def get_profile(profile_id: str):
     return profile
 
 @router.patch("/{profile_id}")
-async def update_profile_partial(profile_id: str, profile_update: ProfileUpdate):
+async def update_profile_partial(object_id: ProfileObjectId, profile_update: ProfileUpdate):
     """
     Partially update a user profile (progressive onboarding).
     Only provided fields will be updated, others remain unchanged.
     """
     collection = get_profiles_collection()
     
-    # Validate ObjectId
-    try:
-        object_id = ObjectId(profile_id)
-    except Exception:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid profile ID format"
-        )
-    
     # Check if profile exists
     existing_profile = await collection.find_one({"_id": object_id})
     if not existing_profile:
@@ -146,22 +144,13 @@ async def update_profile_partial(profile_id: str, profile_update: ProfileUpdate)
     return updated_profile
 
 @router.put("/{profile_id}")
-async def update_profile_full(profile_id: str, profile: Profile):
+async def update_profile_full(object_id: ProfileObjectId, profile: Profile):
     """
     Fully replace a user profile (legacy endpoint).
     Use PATCH for progressive updates instead.
     """
     collection = get_profiles_collection()
     
-    # Validate ObjectId
-    try:
-        object_id = ObjectId(profile_id)
-    except Exception:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid profile ID format"
-        )
-    
     # Check if profile exists
     existing_profile = await collection.find_one({"_id": object_id})
     if not existing_profile:
@@ -4,6 +4,7 @@ Implements Sprint S2 requirements for BR-2 and BR-3.
 """
 from fastapi import APIRouter, HTTPException, status
 from typing import List
+import asyncio
 
 from ..shared.database import get_database
 from ..shared.simple_debt_models import SimpleDebt
@@ -36,8 +37,11 @@ async def recommend_strategy(request: StrategyRecommendationRequest):
     """
     db = await get_database()
     
-    # Fetch profile
-    profile_data = await db.profiles.find_one({"user_id": request.profile_id})
+    # Fetch profile and debts concurrently
+    profile_data, debts_data = await asyncio.gather(
+        db.profiles.find_one({"user_id": request.profile_id}),
+        db.debts.find({"profile_id": request.profile_id}).to_list(length=None)
+    )
     if not profile_data:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -50,10 +54,6 @@ async def recommend_strategy(request: StrategyRecommendationRequest):
     
     profile = Profile(**profile_data)
     
-    # Fetch all debts
-    debts_cursor = db.debts.find({"profile_id": request.profile_id})
-    debts_data = await debts_cursor.to_list(length=None)
-    
     if not debts_data:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -140,8 +140,11 @@ async def calculate_recommendation_confidence(request: dict):
     
     db = await get_database()
     
-    # Fetch profile
-    profile_data = await db.profiles.find_one({"user_id": profile_id})
+    # Fetch profile and debts concurrently
+    profile_data, debts_data = await asyncio.gather(
+        db.profiles.find_one({"user_id": profile_id}),
+        db.debts.find({"profile_id": profile_id}).to_list(length=None)
+    )
     if not profile_data:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -154,10 +157,6 @@ async def calculate_recommendation_confidence(request: dict):
     
     profile = Profile(**profile_data)
     
-    # Fetch debts
-    debts_cursor = db.debts.find({"profile_id": profile_id})
-    debts_data = await debts_cursor.to_list(length=None)
-    
     # Convert ObjectId to string and fix date format for each debt
     for debt in debts_data:
         if '_id' in debt:
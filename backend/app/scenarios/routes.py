@@ -6,6 +6,7 @@ from fastapi import APIRouter, HTTPException, status
 from typing import List
 from datetime import date, timedelta
 from copy import deepcopy
+import asyncio
 
 from ..shared.database import get_database
 from ..shared.simple_debt_models import SimpleDebt
@@ -21,7 +22,8 @@ from ..shared.calculation_utils import (
     simulate_payoff_scenario,
     calculate_minimum_payment_scenario,
     compare_scenarios,
-    calculate_confidence_score
+    calculate_confidence_score,
+    order_debts_by_strategy
 )
 
 router = APIRouter(prefix="/api/v1/scenarios", tags=["scenarios"])
@@ -165,9 +167,11 @@ async def optimize_payment(request: OptimizePaymentRequest):
     """
     db = await get_database()
     
-    # Fetch all debts for the profile
-    debts_cursor = db.debts.find({"profile_id": request.profile_id})
-    debts_data = await debts_cursor.to_list(length=None)
+    # Fetch debts and profile concurrently
+    debts_data, profile_data = await asyncio.gather(
+        db.debts.find({"profile_id": request.profile_id}).to_list(length=None),
+        db.profiles.find_one({"user_id": request.profile_id})
+    )
     
     if not debts_data:
         raise HTTPException(
@@ -175,8 +179,7 @@ async def optimize_payment(request: OptimizePaymentRequest):
             detail="No debts found for this profile"
         )
     
-    # Fetch profile for context
-    profile_data = await db.profiles.find_one({"user_id": request.profile_id})
+    # Profile is required for context
     if not profile_data:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -340,7 +343,6 @@ def _simulate_extra_payment(
             target_debt.balance = max(0, target_debt.balance - request.extra_payment_amount)
     else:
         # Apply to first debt in strategy order
-        from ..shared.calculation_utils import order_debts_by_strategy
         ordered = order_debts_by_strategy(modified_debts, request.strategy)
         if ordered:
             ordered[0].balance = max(0, ordered[0].balance - request.extra_payment_amount)
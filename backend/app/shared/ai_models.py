@@ -7,6 +7,7 @@ Ensures stability, safety, and predictable frontend integration.
 from pydantic import BaseModel, Field, validator
 from typing import List, Optional, Dict, Any, Literal
 from datetime import datetime
+import re
 import uuid
 
 
@@ -257,17 +258,20 @@ class AIErrorResponse(BaseModel):
 # Sanitization and Validation Utilities
 # ============================================================================
 
+_HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
+_SCRIPT_PATTERN = re.compile(r'<script.*?</script>', re.DOTALL | re.IGNORECASE)
+
+
 def sanitize_ai_content(content: str) -> str:
     """
     Sanitize AI-generated content before sending to frontend.
     Removes potentially harmful content and ensures safe display.
     """
     # Remove any HTML tags
-    import re
-    content = re.sub(r'<[^>]+>', '', content)
+    content = _HTML_TAG_PATTERN.sub('', content)
     
     # Remove any script-like content
-    content = re.sub(r'<script.*?</script>', '', content, flags=re.DOTALL | re.IGNORECASE)
+    content = _SCRIPT_PATTERN.sub('', content)
     
     # Trim whitespace
     content = content.strip()
@@ -4,12 +4,22 @@ Manages AI-powered features including insights, Q&A, and onboarding.
 Uses the LLM provider abstraction and prompt templates from configuration.
 """
 
+import functools
+import hashlib
+import json
 import logging
+import time
+import orjson
 import yaml
-from typing import Dict, Any, Optional, List
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Dict, Any, Optional, List, Callable, AsyncIterator
 from pathlib import Path
 
+from pydantic import BaseModel
+
 from .llm_provider import LLMProviderFactory
+from .response_cache import get_response_cache
 from .clara_fallbacks import get_clara_fallback, get_resume_message
 from .ai_models import (
     InsightsResponse, InsightsResponseContent,
@@ -23,6 +33,83 @@ from .ai_models import (
 
 logger = logging.getLogger(__name__)
 
+# Set when a call degrades to its fallback response, so callers can avoid
+# caching it. Each request runs in its own context, so this starts False.
+_fallback_used: ContextVar[bool] = ContextVar("ai_fallback_used", default=False)
+
+
+def fallback_used() -> bool:
+    """Whether the last AI call in this context returned a fallback response"""
+    return _fallback_used.get()
+
+
+# ============================================================================
+# Response Caching
+# ============================================================================
+
+# Clear functions for every exact-match response cache, used on config reload
+_response_cache_clearers: List[Callable[[], None]] = []
+
+
+def _snapshot(result: Any) -> Any:
+    """Capture a response for caching, dropping per-response identifiers"""
+    if isinstance(result, BaseModel):
+        return type(result), result.model_dump(exclude={"request_id", "timestamp"})
+    return None, result
+
+
+def _restore(snapshot: Any) -> Any:
+    """Rebuild a cached response with a fresh request_id and timestamp"""
+    model_cls, data = snapshot
+    return model_cls(**data) if model_cls is not None else data
+
+
+def async_ttl_cache(maxsize: int = 4096, ttl: int = 900):
+    """
+    Cache AI service responses keyed on the exact call arguments.
+    
+    Byte-identical requests (retries, replays, repeated onboarding steps)
+    are answered from memory instead of calling the LLM provider. Entries
+    expire after `ttl` seconds and the least recently used entry is evicted
+    once `maxsize` is reached. Fallback responses are never cached.
+    """
+    def decorator(func):
+        cache: "OrderedDict[bytes, tuple]" = OrderedDict()
+        
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            canonical = orjson.dumps([args, kwargs], option=orjson.OPT_SORT_KEYS, default=str)
+            key = hashlib.blake2b(canonical).digest()
+            now = time.monotonic()
+            
+            entry = cache.get(key)
+            if entry is not None:
+                stored_at, snapshot = entry
+                if now - stored_at < ttl:
+                    cache.move_to_end(key)
+                    return _restore(snapshot)
+                del cache[key]
+            
+            _fallback_used.set(False)
+            result = await func(self, *args, **kwargs)
+            if not _fallback_used.get():
+                cache[key] = (now, _snapshot(result))
+                if len(cache) > maxsize:
+                    cache.popitem(last=False)
+            return result
+        
+        wrapper.cache_clear = cache.clear
+        _response_cache_clearers.append(cache.clear)
+        return wrapper
+    return decorator
+
+
+def clear_response_caches():
+    """Drop all cached AI responses"""
+    for clear in _response_cache_clearers:
+        clear()
+    get_response_cache().clear()
+
 
 # ============================================================================
 # Configuration Loader
@@ -120,6 +207,7 @@ class AIService:
         self.config = AIPromptConfig()
         self.provider = LLMProviderFactory.get_provider()
     
+    @async_ttl_cache(maxsize=4096, ttl=900)
     async def generate_insights(
         self,
         profile_data: Dict[str, Any],
@@ -195,11 +283,13 @@ class AIService:
                 
         except Exception as e:
             logger.error(f"Error generating insights: {e}")
+            _fallback_used.set(True)
             # Return fallback response
             fallback = self.config.get_fallback_response("insights")
             content = InsightsResponseContent(**fallback)
             return InsightsResponse(response=content)
     
+    @async_ttl_cache(maxsize=4096, ttl=900)
     async def answer_question(
         self,
         question: str,
@@ -220,33 +310,7 @@ class AIService:
             QAResponse with answer and related information
         """
         try:
-            # Prepare context
-            total_debt = sum(d.get("balance", 0) for d in debt_data) if debt_data else 0
-            debt_count = len(debt_data) if debt_data else 0
-            
-            # Get prompt template
-            template = self.config.get_prompt_template("qa", "general_question")
-            
-            # If no template found, use a simple default
-            if not template:
-                template = """User question: {question}
-
-Context:
-- Total debt: ${total_debt}
-- Number of debts: {debt_count}
-- Primary goal: {primary_goal}
-- Current strategy: {current_strategy}
-
-Please provide a helpful, personalized answer based on this context."""
-            
-            # Fill in template
-            prompt = template.format(
-                question=question,
-                total_debt=f"{total_debt:.2f}",
-                debt_count=debt_count,
-                primary_goal=profile_data.get('primary_goal', 'pay-faster'),
-                current_strategy=context.get('current_strategy', 'not selected') if context else 'not selected'
-            )
+            prompt = self._build_qa_prompt(question, profile_data, debt_data, context)
             
             # Get system prompt
             system_prompt = self.config.get_system_prompt("ask")
@@ -261,44 +325,136 @@ Please provide a helpful, personalized answer based on this context."""
             )
             logger.info(f"Received response from LLM: {response_data}")
             
-            # Sanitize content
-            if "answer" in response_data:
-                response_data["answer"] = sanitize_ai_content(response_data["answer"])
-            
-            # Ensure arrays don't exceed limits
-            if "next_steps" in response_data and isinstance(response_data["next_steps"], list):
-                response_data["next_steps"] = response_data["next_steps"][:5]  # Max 5
-            if "related_topics" in response_data and isinstance(response_data["related_topics"], list):
-                response_data["related_topics"] = response_data["related_topics"][:4]  # Max 4
-            
-            # Validate and create response
-            try:
-                content = QAResponseContent(**response_data)
-                return QAResponse(response=content)
-            except Exception as validation_error:
-                logger.error(f"Pydantic validation failed: {validation_error}")
-                logger.error(f"Response data: {response_data}")
-                raise ValueError(f"Invalid response structure from LLM: {validation_error}")
+            return self._build_qa_response(response_data)
                 
         except Exception as e:
             logger.error(f"Error answering question: {e}", exc_info=True)
-            
-            # Create a helpful, context-aware fallback response
-            fallback = {
-                "answer": "I'd love to help answer that! However, I'm having a temporary issue connecting to my knowledge base right now. While I work on that, here are some general debt management principles:\n\n• Paying off high-interest debt first (avalanche method) typically saves the most money\n• Paying off smallest balances first (snowball method) can provide quick wins and motivation\n• Making extra payments beyond minimums accelerates your debt-free date\n• Consider your personal goals and what motivates you most\n\nPlease try asking your question again in a moment, or feel free to explore your Dashboard for personalized insights!",
-                "context": "This is a general response due to a temporary service issue",
-                "next_steps": [
-                    "Try asking your question again",
-                    "Explore your personalized Dashboard insights",
-                    "Review your debt payoff strategies"
-                ],
-                "related_topics": ["Debt Payoff Strategies", "Interest Savings", "Payment Planning"],
-                "confidence": "low"
-            }
-            
-            content = QAResponseContent(**fallback)
+            _fallback_used.set(True)
+            return self.qa_fallback_response()
+    
+    async def answer_question_stream(
+        self,
+        question: str,
+        profile_data: Dict[str, Any],
+        debt_data: List[Dict[str, Any]],
+        context: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream the raw answer text as the provider generates it.
+        
+        The streamed text is the same JSON document `answer_question` parses;
+        pass the joined chunks to `parse_qa_response` once the stream ends.
+        
+        Args:
+            question: User's question
+            profile_data: User profile information
+            debt_data: List of user's debts
+            context: Additional context
+        
+        Yields:
+            Text deltas from the LLM provider
+        """
+        prompt = self._build_qa_prompt(question, profile_data, debt_data, context)
+        async for chunk in self.provider.stream_text(
+            prompt=prompt,
+            system_prompt=self.config.get_system_prompt("ask"),
+            temperature=0.7,
+            max_tokens=2000,
+            json_mode=True
+        ):
+            yield chunk
+    
+    def parse_qa_response(self, text: str) -> QAResponse:
+        """
+        Parse a streamed answer into a validated QAResponse.
+        
+        Raises:
+            ValueError: If the text is not a valid Q&A response
+        """
+        try:
+            response_data = orjson.loads(text)
+        except orjson.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON response from LLM: {e}")
+        return self._build_qa_response(response_data)
+    
+    @staticmethod
+    def qa_fallback_response() -> QAResponse:
+        """Build the general-guidance answer used when the LLM is unavailable"""
+        # Create a helpful, context-aware fallback response
+        fallback = {
+            "answer": "I'd love to help answer that! However, I'm having a temporary issue connecting to my knowledge base right now. While I work on that, here are some general debt management principles:\n\n• Paying off high-interest debt first (avalanche method) typically saves the most money\n• Paying off smallest balances first (snowball method) can provide quick wins and motivation\n• Making extra payments beyond minimums accelerates your debt-free date\n• Consider your personal goals and what motivates you most\n\nPlease try asking your question again in a moment, or feel free to explore your Dashboard for personalized insights!",
+            "context": "This is a general response due to a temporary service issue",
+            "next_steps": [
+                "Try asking your question again",
+                "Explore your personalized Dashboard insights",
+                "Review your debt payoff strategies"
+            ],
+            "related_topics": ["Debt Payoff Strategies", "Interest Savings", "Payment Planning"],
+            "confidence": "low"
+        }
+        
+        content = QAResponseContent(**fallback)
+        return QAResponse(response=content)
+    
+    def _build_qa_prompt(
+        self,
+        question: str,
+        profile_data: Dict[str, Any],
+        debt_data: List[Dict[str, Any]],
+        context: Optional[Dict[str, Any]]
+    ) -> str:
+        """Fill the Q&A prompt template for a question"""
+        # Prepare context
+        total_debt = sum(d.get("balance", 0) for d in debt_data) if debt_data else 0
+        debt_count = len(debt_data) if debt_data else 0
+        
+        # Get prompt template
+        template = self.config.get_prompt_template("qa", "general_question")
+        
+        # If no template found, use a simple default
+        if not template:
+            template = """Please provide a helpful, personalized answer to the user question based on the context below.
+
+### USER DATA
+Context:
+- Total debt: ${total_debt}
+- Number of debts: {debt_count}
+- Primary goal: {primary_goal}
+- Current strategy: {current_strategy}
+
+User question: {question}"""
+        
+        # Fill in template
+        return template.format(
+            question=question,
+            total_debt=f"{total_debt:.2f}",
+            debt_count=debt_count,
+            primary_goal=profile_data.get('primary_goal', 'pay-faster'),
+            current_strategy=context.get('current_strategy', 'not selected') if context else 'not selected'
+        )
+    
+    def _build_qa_response(self, response_data: Dict[str, Any]) -> QAResponse:
+        """Sanitize and validate raw LLM output into a QAResponse"""
+        # Sanitize content
+        if "answer" in response_data:
+            response_data["answer"] = sanitize_ai_content(response_data["answer"])
+        
+        # Ensure arrays don't exceed limits
+        if "next_steps" in response_data and isinstance(response_data["next_steps"], list):
+            response_data["next_steps"] = response_data["next_steps"][:5]  # Max 5
+        if "related_topics" in response_data and isinstance(response_data["related_topics"], list):
+            response_data["related_topics"] = response_data["related_topics"][:4]  # Max 4
+        
+        # Validate and create response
+        try:
+            content = QAResponseContent(**response_data)
             return QAResponse(response=content)
+        except Exception as validation_error:
+            logger.error(f"Pydantic validation failed: {validation_error}")
+            logger.error(f"Response data: {response_data}")
+            raise ValueError(f"Invalid response structure from LLM: {validation_error}")
     
+    @async_ttl_cache(maxsize=4096, ttl=900)
     async def compare_strategies(
         self,
         profile_data: Dict[str, Any],
@@ -358,11 +514,13 @@ Please provide a helpful, personalized answer based on this context."""
                 
         except Exception as e:
             logger.error(f"Error comparing strategies: {e}")
+            _fallback_used.set(True)
             # Return fallback response
             fallback = self.config.get_fallback_response("strategy_comparison")
             content = StrategyComparisonContent(**fallback)
             return StrategyComparisonResponse(response=content)
     
+    @async_ttl_cache(maxsize=4096, ttl=900)
     async def generate_onboarding_message(
         self,
         step: str,
@@ -415,11 +573,13 @@ Please provide a helpful, personalized answer based on this context."""
                 
         except Exception as e:
             logger.error(f"Error generating onboarding message: {e}")
+            _fallback_used.set(True)
             # Return fallback response
             fallback = self.config.get_fallback_response("onboarding")
             content = OnboardingResponseContent(**fallback)
             return OnboardingResponse(response=content)
     
+    @async_ttl_cache(maxsize=4096, ttl=900)
     async def generate_onboarding_reaction(
         self,
         step_id: str,
@@ -445,7 +605,6 @@ Please provide a helpful, personalized answer based on this context."""
             answers_with_context = {**user_answers, "is_resume": is_resume}
             
             # Fill in template
-            import json
             prompt = template.format(
                 user_answers=json.dumps(answers_with_context, indent=2),
                 step_id=step_id
@@ -470,6 +629,7 @@ Please provide a helpful, personalized answer based on this context."""
                 
         except Exception as e:
             logger.error(f"Error generating onboarding reaction: {e}")
+            _fallback_used.set(True)
             # Use context-aware fallback message
             if is_resume:
                 return get_resume_message()
@@ -515,6 +675,7 @@ Please provide a helpful, personalized answer based on this context."""
     def reload_config(self):
         """Reload AI prompt configuration"""
         self.config.reload()
+        clear_response_caches()
         logger.info("AI service configuration reloaded")
 
 
@@ -526,7 +687,12 @@ _ai_service_instance: Optional[AIService] = None
 
 
 def get_ai_service() -> AIService:
-    """Get or create AI service singleton instance"""
+    """
+    Get or create AI service singleton instance.
+    
+    The first call loads prompt configuration and builds the provider client
+    (SDK import, pooled HTTP client); later calls reuse both.
+    """
     global _ai_service_instance
     if _ai_service_instance is None:
         _ai_service_instance = AIService()
@@ -1,13 +1,36 @@
-from motor.motor_asyncio import AsyncIOMotorClient
-from typing import Optional
+from typing import Optional, Dict, Any
+import logging
 import os
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Connection pool sizing per worker process. Handlers fan out concurrent
+# queries with asyncio.gather, so a roomy pool keeps them from queueing for a
+# connection; a warm minimum avoids TLS handshakes on bursts; and a bounded
+# wait queue fails fast instead of piling up requests when the pool is exhausted.
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "20"))
+MONGO_MAX_IDLE_TIME_MS = 30000
+MONGO_WAIT_QUEUE_TIMEOUT_MS = 2000
+
+# Motor runs every PyMongo call on a thread pool sized when motor is first
+# imported, so that pool caps concurrent operations per process. Unless
+# configured, size it to the connection pool so neither limits the other.
+# Must be set before importing motor.
+os.environ.setdefault("MOTOR_MAX_WORKERS", str(MONGO_MAX_POOL_SIZE))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+logger = logging.getLogger(__name__)
+
 class Database:
     client: Optional[AsyncIOMotorClient] = None
+    # Motor builds a new wrapper object on every attribute/item lookup, so the
+    # database and collection handles are resolved once per client and reused
+    _db = None
+    _collections: Dict[str, Any] = {}
     
     @classmethod
     async def connect_db(cls):
@@ -22,12 +45,18 @@ class Database:
                 database_url,
                 serverSelectionTimeoutMS=30000,
                 connectTimeoutMS=30000,
-                socketTimeoutMS=30000
+                socketTimeoutMS=30000,
+                maxPoolSize=MONGO_MAX_POOL_SIZE,
+                minPoolSize=MONGO_MIN_POOL_SIZE,
+                maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+                waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS
             )
+            cls._reset_handles()
             
             # Test the connection
             await cls.client.admin.command('ping')
             print("✓ Successfully connected to MongoDB Atlas")
+            print(f"   Connection pool: {MONGO_MIN_POOL_SIZE}-{MONGO_MAX_POOL_SIZE} connections per worker")
         except Exception as e:
             print(f"✗ Failed to connect to MongoDB Atlas: {str(e)}")
             print(f"   Possible issues:")
@@ -36,26 +65,72 @@ class Database:
             print(f"   3. Ensure cluster is running")
             print(f"   4. Check network connectivity")
             raise
+        
+        await cls.ensure_indexes()
+    
+    @classmethod
+    async def ensure_indexes(cls):
+        """
+        Create the indexes used by hot query paths (no-op if they exist).
+        
+        Index failures are logged rather than raised: queries still work
+        without them, so a bad index must not keep the app from starting.
+        """
+        db = cls.get_database()
+        # Compound indexes also serve queries on their profile_id prefix alone
+        indexes = [
+            (db.debts, [("profile_id", 1), ("status", 1)], {}),
+            (db.debts, [("profile_id", 1), ("_id", 1)], {}),
+            (db.analytics_events, [("profile_id", 1), ("event_type", 1), ("timestamp", -1)], {}),
+            # Milestone upserts key on (profile_id, milestone_type)
+            (db.milestones, [("profile_id", 1), ("milestone_type", 1)], {"unique": True}),
+            (db.milestones, [("profile_id", 1), ("achieved_at", -1)], {}),
+            (db.milestones, [("profile_id", 1), ("celebration_shown", 1)], {}),
+            # Mark-shown looks a milestone up by its ID alone
+            (db.milestones, [("milestone_id", 1)], {"unique": True}),
+        ]
+        for collection, keys, options in indexes:
+            try:
+                await collection.create_index(keys, **options)
+            except Exception as e:
+                logger.error("Failed to create index %s on %s: %s", keys, collection.name, e)
     
     @classmethod
     async def close_db(cls):
         """Close MongoDB connection"""
         if cls.client:
             cls.client.close()
+            cls.client = None
+            cls._reset_handles()
             print("Closed MongoDB connection")
     
+    @classmethod
+    def _reset_handles(cls):
+        """Forget handles resolved from a previous client"""
+        cls._db = None
+        cls._collections.clear()
+    
+    @classmethod
+    def is_connected(cls) -> bool:
+        """Whether a client is connected (local state only, no I/O)"""
+        return cls.client is not None
+    
     @classmethod
     def get_database(cls):
         """Get the database instance"""
         if not cls.client:
             raise ValueError("Database not connected. Call connect_db() first.")
-        return cls.client.pathlight
+        if cls._db is None:
+            cls._db = cls.client.pathlight
+        return cls._db
     
     @classmethod
     def get_collection(cls, collection_name: str):
         """Get a specific collection"""
-        db = cls.get_database()
-        return db[collection_name]
+        collection = cls._collections.get(collection_name)
+        if collection is None:
+            collection = cls._collections[collection_name] = cls.get_database()[collection_name]
+        return collection
 
 # Convenience function to get database
 def get_db():
@@ -0,0 +1,72 @@
+"""
+Database Helpers
+Shared query helpers for fetching a profile together with its debts.
+"""
+
+from bson import ObjectId
+from typing import Dict, Any, Optional, List, Tuple
+
+# Cap on debts loaded for a single profile
+MAX_DEBTS_PER_PROFILE = 100
+
+
+def profile_match(profile_id: str) -> Dict[str, Any]:
+    """
+    Build the filter for a profile identifier.
+
+    Identifiers that are valid MongoDB ObjectIds match on `_id` or `user_id`
+    in a single query; anything else is only a `user_id` (used by test
+    profiles like "test-profile-6").
+    """
+    if ObjectId.is_valid(profile_id):
+        return {"$or": [{"_id": ObjectId(profile_id)}, {"user_id": profile_id}]}
+    return {"user_id": profile_id}
+
+
+async def fetch_profile(db, profile_id: str) -> Optional[Dict[str, Any]]:
+    """Fetch a profile by ObjectId or user_id"""
+    return await db.profiles.find_one(profile_match(profile_id))
+
+
+async def fetch_profile_with_debts(
+    db,
+    profile_id: str,
+    debt_projection: Optional[Dict[str, int]] = None
+) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Fetch a profile and its debts in a single round trip.
+
+    Debts are joined with a `$lookup` on `profile_id`, which is the identifier
+    the client sent (not necessarily the profile's `_id`).
+
+    Args:
+        db: Database connection
+        profile_id: Profile ObjectId or user_id
+        debt_projection: Optional projection applied to each debt
+
+    Returns:
+        Tuple of (profile or None, list of debts)
+    """
+    debt_pipeline: List[Dict[str, Any]] = [
+        {"$match": {"profile_id": profile_id}},
+        {"$limit": MAX_DEBTS_PER_PROFILE}
+    ]
+    if debt_projection:
+        debt_pipeline.append({"$project": debt_projection})
+
+    pipeline = [
+        {"$match": profile_match(profile_id)},
+        {"$limit": 1},
+        {"$lookup": {
+            "from": "debts",
+            "pipeline": debt_pipeline,
+            "as": "debts"
+        }}
+    ]
+
+    results = await db.profiles.aggregate(pipeline).to_list(length=1)
+    if not results:
+        return None, []
+
+    profile = results[0]
+    return profile, profile.pop("debts", [])
@@ -20,6 +20,7 @@ Enhancements:
 from typing import List, Dict, Any, Optional, Literal
 from pydantic import BaseModel, Field
 from enum import Enum
+from datetime import datetime, timezone
 import logging
 
 logger = logging.getLogger(__name__)
@@ -924,7 +925,6 @@ async def assess_financial_health(
     )
     
     # Add timestamp
-    from datetime import datetime, timezone
     generated_at = datetime.now(timezone.utc).isoformat()
     
     return FinancialAssessmentResult(
@@ -7,7 +7,8 @@ Allows easy switching between providers without changing application code.
 import os
 import json
 import logging
-from typing import Dict, Any, Optional, List, Literal
+import orjson
+from typing import Dict, Any, Optional, List, Literal, AsyncIterator
 from abc import ABC, abstractmethod
 from dotenv import load_dotenv
 
@@ -16,6 +17,24 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# HTTP settings shared by providers whose SDKs accept an httpx client
+HTTP_MAX_CONNECTIONS = 100
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 50
+HTTP_TIMEOUT_SECONDS = 30.0
+HTTP_CONNECT_TIMEOUT_SECONDS = 5.0
+
+
+def _build_http_client():
+    """Create a pooled keep-alive HTTP client, reused for every LLM call"""
+    import httpx
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS
+        ),
+        timeout=httpx.Timeout(HTTP_TIMEOUT_SECONDS, connect=HTTP_CONNECT_TIMEOUT_SECONDS)
+    )
+
 
 # ============================================================================
 # Base Provider Interface
@@ -51,10 +70,35 @@ class LLMProvider(ABC):
         """Generate JSON response"""
         pass
     
+    async def stream_text(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        json_mode: bool = False
+    ) -> AsyncIterator[str]:
+        """
+        Stream a text completion as it is generated.
+        
+        Providers without native streaming yield the full completion at once.
+        """
+        yield await self.generate_text(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            json_mode=json_mode
+        )
+    
     @abstractmethod
     def get_provider_name(self) -> str:
         """Get provider name"""
         pass
+    
+    async def aclose(self):
+        """Release network resources held by the provider"""
+        pass
 
 
 # ============================================================================
@@ -68,9 +112,18 @@ class GeminiProvider(LLMProvider):
         super().__init__(api_key, model)
         try:
             import google.generativeai as genai
+            from google.generativeai.types import HarmCategory, HarmBlockThreshold
             genai.configure(api_key=api_key)
             self.genai = genai
             self.client = genai.GenerativeModel(model)
+            
+            # Configure safety settings to be less restrictive for financial content
+            self.safety_settings = {
+                HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
+                HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
+                HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
+                HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
+            }
             logger.info(f"Initialized Gemini provider with model: {model}")
         except ImportError:
             raise ImportError("google-generativeai package not installed. Run: pip install google-generativeai")
@@ -88,44 +141,77 @@ class GeminiProvider(LLMProvider):
     ) -> str:
         """Generate text completion using Gemini"""
         try:
-            # Combine system prompt and user prompt
-            full_prompt = prompt
-            if system_prompt:
-                full_prompt = f"{system_prompt}\n\n{prompt}"
-            
-            # Configure generation
-            generation_config = {
-                "temperature": temperature,
-                "max_output_tokens": max_tokens,
-            }
-            
-            if json_mode:
-                generation_config["response_mime_type"] = "application/json"
-            
-            # Configure safety settings to be less restrictive for financial content
-            # Use the actual enum values from the SDK
-            from google.generativeai.types import HarmCategory, HarmBlockThreshold
-            
-            safety_settings = {
-                HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
-            }
+            full_prompt, generation_config = self._build_request(
+                prompt, system_prompt, temperature, max_tokens, json_mode
+            )
             
             # Generate response
-            response = self.client.generate_content(
+            response = await self.client.generate_content_async(
                 full_prompt,
                 generation_config=generation_config,
-                safety_settings=safety_settings
+                safety_settings=self.safety_settings
             )
             
+            usage = getattr(response, "usage_metadata", None)
+            if usage is not None:
+                logger.debug(
+                    f"Gemini usage: prompt_tokens={usage.prompt_token_count}, "
+                    f"cached_tokens={getattr(usage, 'cached_content_token_count', 0)}"
+                )
+            
             return response.text
             
         except Exception as e:
             logger.error(f"Gemini generation error: {e}")
             raise
     
+    async def stream_text(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        json_mode: bool = False
+    ) -> AsyncIterator[str]:
+        """Stream text completion using Gemini"""
+        full_prompt, generation_config = self._build_request(
+            prompt, system_prompt, temperature, max_tokens, json_mode
+        )
+        response = await self.client.generate_content_async(
+            full_prompt,
+            generation_config=generation_config,
+            safety_settings=self.safety_settings,
+            stream=True
+        )
+        async for chunk in response:
+            if chunk.text:
+                yield chunk.text
+    
+    def _build_request(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        json_mode: bool
+    ) -> tuple:
+        """Build the combined prompt and generation config for a Gemini call"""
+        # Combine system prompt and user prompt
+        full_prompt = prompt
+        if system_prompt:
+            full_prompt = f"{system_prompt}\n\n{prompt}"
+        
+        # Configure generation
+        generation_config = {
+            "temperature": temperature,
+            "max_output_tokens": max_tokens,
+        }
+        
+        if json_mode:
+            generation_config["response_mime_type"] = "application/json"
+        
+        return full_prompt, generation_config
+    
     async def generate_json(
         self,
         prompt: str,
@@ -144,7 +230,7 @@ class GeminiProvider(LLMProvider):
             )
             
             # Parse JSON response
-            return json.loads(text_response)
+            return orjson.loads(text_response)
             
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse JSON from Gemini: {e}")
@@ -168,8 +254,9 @@ class ClaudeProvider(LLMProvider):
     def __init__(self, api_key: str, model: str = "claude-3-5-haiku-20241022"):
         super().__init__(api_key, model)
         try:
-            from anthropic import Anthropic
-            self.client = Anthropic(api_key=api_key)
+            from anthropic import AsyncAnthropic
+            self.http_client = _build_http_client()
+            self.client = AsyncAnthropic(api_key=api_key, http_client=self.http_client)
             logger.info(f"Initialized Claude provider with model: {model}")
         except ImportError:
             raise ImportError("anthropic package not installed. Run: pip install anthropic")
@@ -187,19 +274,15 @@ class ClaudeProvider(LLMProvider):
     ) -> str:
         """Generate text completion using Claude"""
         try:
-            messages = [{"role": "user", "content": prompt}]
-            
-            kwargs = {
-                "model": self.model,
-                "max_tokens": max_tokens,
-                "temperature": temperature,
-                "messages": messages
-            }
+            kwargs = self._build_kwargs(prompt, system_prompt, temperature, max_tokens)
+            response = await self.client.messages.create(**kwargs)
             
-            if system_prompt:
-                kwargs["system"] = system_prompt
-            
-            response = self.client.messages.create(**kwargs)
+            usage = getattr(response, "usage", None)
+            if usage is not None:
+                logger.debug(
+                    f"Claude usage: input_tokens={usage.input_tokens}, "
+                    f"cached_tokens={getattr(usage, 'cache_read_input_tokens', 0)}"
+                )
             
             return response.content[0].text
             
@@ -207,6 +290,47 @@ class ClaudeProvider(LLMProvider):
             logger.error(f"Claude generation error: {e}")
             raise
     
+    async def stream_text(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        json_mode: bool = False
+    ) -> AsyncIterator[str]:
+        """Stream text completion using Claude"""
+        kwargs = self._build_kwargs(prompt, system_prompt, temperature, max_tokens)
+        async with self.client.messages.stream(**kwargs) as stream:
+            async for text in stream.text_stream:
+                yield text
+    
+    def _build_kwargs(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: float,
+        max_tokens: int
+    ) -> Dict[str, Any]:
+        """Build the Messages API arguments for a Claude call"""
+        messages = [{"role": "user", "content": prompt}]
+        
+        kwargs = {
+            "model": self.model,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "messages": messages
+        }
+        
+        if system_prompt:
+            # Mark the static system block as a cacheable prompt prefix
+            kwargs["system"] = [{
+                "type": "text",
+                "text": system_prompt,
+                "cache_control": {"type": "ephemeral"}
+            }]
+        
+        return kwargs
+    
     async def generate_json(
         self,
         prompt: str,
@@ -227,7 +351,7 @@ class ClaudeProvider(LLMProvider):
             )
             
             # Parse JSON response
-            return json.loads(text_response)
+            return orjson.loads(text_response)
             
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse JSON from Claude: {e}")
@@ -239,6 +363,9 @@ class ClaudeProvider(LLMProvider):
     
     def get_provider_name(self) -> str:
         return "claude"
+    
+    async def aclose(self):
+        await self.http_client.aclose()
 
 
 # ============================================================================
@@ -251,8 +378,9 @@ class OpenAIProvider(LLMProvider):
     def __init__(self, api_key: str, model: str = "gpt-4o-mini"):
         super().__init__(api_key, model)
         try:
-            from openai import OpenAI
-            self.client = OpenAI(api_key=api_key)
+            from openai import AsyncOpenAI
+            self.http_client = _build_http_client()
+            self.client = AsyncOpenAI(api_key=api_key, http_client=self.http_client)
             logger.info(f"Initialized OpenAI provider with model: {model}")
         except ImportError:
             raise ImportError("openai package not installed. Run: pip install openai")
@@ -270,24 +398,16 @@ class OpenAIProvider(LLMProvider):
     ) -> str:
         """Generate text completion using OpenAI"""
         try:
-            messages = []
-            
-            if system_prompt:
-                messages.append({"role": "system", "content": system_prompt})
+            kwargs = self._build_kwargs(prompt, system_prompt, temperature, max_tokens, json_mode)
+            response = await self.client.chat.completions.create(**kwargs)
             
-            messages.append({"role": "user", "content": prompt})
-            
-            kwargs = {
-                "model": self.model,
-                "messages": messages,
-                "temperature": temperature,
-                "max_tokens": max_tokens
-            }
-            
-            if json_mode:
-                kwargs["response_format"] = {"type": "json_object"}
-            
-            response = self.client.chat.completions.create(**kwargs)
+            usage = getattr(response, "usage", None)
+            if usage is not None:
+                details = getattr(usage, "prompt_tokens_details", None)
+                logger.debug(
+                    f"OpenAI usage: prompt_tokens={usage.prompt_tokens}, "
+                    f"cached_tokens={getattr(details, 'cached_tokens', 0)}"
+                )
             
             return response.choices[0].message.content
             
@@ -295,6 +415,49 @@ class OpenAIProvider(LLMProvider):
             logger.error(f"OpenAI generation error: {e}")
             raise
     
+    async def stream_text(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        json_mode: bool = False
+    ) -> AsyncIterator[str]:
+        """Stream text completion using OpenAI"""
+        kwargs = self._build_kwargs(prompt, system_prompt, temperature, max_tokens, json_mode)
+        stream = await self.client.chat.completions.create(**kwargs, stream=True)
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    
+    def _build_kwargs(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        json_mode: bool
+    ) -> Dict[str, Any]:
+        """Build the Chat Completions arguments for an OpenAI call"""
+        messages = []
+        
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        
+        messages.append({"role": "user", "content": prompt})
+        
+        kwargs = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+        
+        if json_mode:
+            kwargs["response_format"] = {"type": "json_object"}
+        
+        return kwargs
+    
     async def generate_json(
         self,
         prompt: str,
@@ -313,7 +476,7 @@ class OpenAIProvider(LLMProvider):
             )
             
             # Parse JSON response
-            return json.loads(text_response)
+            return orjson.loads(text_response)
             
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse JSON from OpenAI: {e}")
@@ -325,6 +488,9 @@ class OpenAIProvider(LLMProvider):
     
     def get_provider_name(self) -> str:
         return "openai"
+    
+    async def aclose(self):
+        await self.http_client.aclose()
 
 
 # ============================================================================
@@ -398,6 +564,13 @@ class LLMProviderFactory:
         """Reset the singleton instance (useful for testing)"""
         cls._instance = None
         cls._provider_type = None
+    
+    @classmethod
+    async def close(cls):
+        """Close the cached provider's connections and reset the singleton"""
+        if cls._instance is not None:
+            await cls._instance.aclose()
+        cls.reset()
 
 
 # ============================================================================
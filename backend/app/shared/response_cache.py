@@ -0,0 +1,149 @@
+"""
+AI Response Cache
+Reuses prior AI responses for repeated requests.
+
+Requests are keyed by a digest of the profile/debt fields the LLM actually
+sees, so a cached answer is only ever reused for the same financial picture.
+The question text is normalized (case, whitespace and trailing punctuation)
+and must otherwise match exactly: numbers and word order are part of the key,
+since "pay the card before the loan" and "pay the loan before the card" call
+for different advice.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+CACHE_TTL_SECONDS = int(os.getenv("RESPONSE_CACHE_TTL", "3600"))
+MAX_ENTRIES = 4096
+
+# Fields from the profile and debts that are rendered into AI prompts
+PROFILE_PROMPT_FIELDS = ("primary_goal", "stress_level", "available_monthly_payment")
+DEBT_PROMPT_FIELDS = ("name", "balance", "apr", "minimum_payment")
+
+# Request context keys whose values change too often for a cached answer to be valid
+VOLATILE_CONTEXT_KEYS = frozenset({"current_date", "timestamp", "session_state", "recent_payment"})
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9$%.]+")
+
+
+# ============================================================================
+# Key Construction
+# ============================================================================
+
+def _digest(data: Any) -> str:
+    """Hash a canonical JSON rendering of the given data"""
+    canonical = orjson.dumps(data, option=orjson.OPT_SORT_KEYS, default=str)
+    return hashlib.sha256(canonical).hexdigest()
+
+
+def profile_digest(profile: Optional[Dict[str, Any]]) -> str:
+    """Digest the profile fields that are visible to the LLM"""
+    profile = profile or {}
+    return _digest({field: profile.get(field) for field in PROFILE_PROMPT_FIELDS})
+
+
+def debt_digest(debts: Optional[List[Dict[str, Any]]]) -> str:
+    """Digest the debt fields that are visible to the LLM"""
+    return _digest([
+        {field: debt.get(field) for field in DEBT_PROMPT_FIELDS}
+        for debt in debts or []
+    ])
+
+
+def normalize_question(question: str) -> str:
+    """Normalize case, whitespace and punctuation while keeping numbers and word order"""
+    tokens = (token.rstrip(".") for token in _TOKEN_PATTERN.findall(question.lower()))
+    return " ".join(token for token in tokens if token)
+
+
+def make_key(
+    question: str,
+    profile: Optional[Dict[str, Any]],
+    debts: Optional[List[Dict[str, Any]]],
+    context: Optional[Dict[str, Any]] = None
+) -> str:
+    """Build the cache key text for a question asked against a profile and its debts"""
+    key = f"{normalize_question(question)}||{profile_digest(profile)}||{debt_digest(debts)}"
+    if context:
+        key += f"||{_digest(context)}"
+    return key
+
+
+def is_cacheable_context(context: Optional[Dict[str, Any]]) -> bool:
+    """Check whether a request context is stable enough to serve from cache"""
+    return not context or VOLATILE_CONTEXT_KEYS.isdisjoint(context.keys())
+
+
+# ============================================================================
+# Cache Store
+# ============================================================================
+
+class ResponseCache:
+    """In-process LRU cache of AI responses keyed by normalized question and profile/debt digest"""
+
+    def __init__(
+        self,
+        ttl_seconds: int = CACHE_TTL_SECONDS,
+        max_entries: int = MAX_ENTRIES
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # key text -> (response, stored_at)
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+
+    def get(self, key_text: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response for the given key text.
+
+        Returns:
+            The cached response if present and not expired, otherwise None
+        """
+        entry = self._entries.get(key_text)
+        if entry is None:
+            return None
+
+        response, stored_at = entry
+        if time.monotonic() - stored_at >= self.ttl_seconds:
+            del self._entries[key_text]
+            return None
+
+        self._entries.move_to_end(key_text)
+        logger.info("Response cache hit")
+        return response
+
+    def put(self, key_text: str, response: Dict[str, Any]) -> None:
+        """Store a response under the given key text"""
+        self._entries[key_text] = (response, time.monotonic())
+        self._entries.move_to_end(key_text)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached responses"""
+        self._entries.clear()
+
+
+# ============================================================================
+# Singleton Instance
+# ============================================================================
+
+_response_cache = ResponseCache()
+
+
+def get_response_cache() -> ResponseCache:
+    """Get the global response cache instance"""
+    return _response_cache
@@ -1,8 +1,14 @@
-from pydantic import BaseModel, Field, field_validator, computed_field
+from pydantic import BaseModel, Field, field_serializer, field_validator, computed_field
 from typing import Optional
-from datetime import datetime, date
+from datetime import datetime, date, timezone
 from .enums import DebtType, APRType, PaymentType, LoanProgram
 
+def _date_to_datetime(value: Optional[date]) -> Optional[datetime]:
+    """MongoDB can't store bare dates; dump them as UTC-midnight datetimes"""
+    if value is None:
+        return None
+    return datetime(value.year, value.month, value.day, tzinfo=timezone.utc)
+
 class SimpleDebt(BaseModel):
     """
     Simplified debt model that matches the frontend structure.
@@ -152,9 +158,15 @@ class SimpleDebt(BaseModel):
     # Timestamps
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+    
+    # Python-mode dumps are MongoDB documents; JSON output keeps ISO dates
+    @field_serializer("next_payment_date", "origination_date", when_used="unless-json")
+    def serialize_dates(self, value: Optional[date]) -> Optional[datetime]:
+        return _date_to_datetime(value)
 
     class Config:
         populate_by_name = True
+        use_enum_values = True
 
 class SimpleDebtUpdate(BaseModel):
     """Model for partial debt updates (PATCH operations)"""
@@ -180,4 +192,11 @@ class SimpleDebtUpdate(BaseModel):
     loan_program: Optional[LoanProgram] = None
     escrow_included: Optional[bool] = None
     property_tax: Optional[float] = Field(None, ge=0)
-    home_insurance: Optional[float] = Field(None, ge=0)
\ No newline at end of file
+    home_insurance: Optional[float] = Field(None, ge=0)
+    
+    @field_serializer("next_payment_date", "origination_date", when_used="unless-json")
+    def serialize_dates(self, value: Optional[date]) -> Optional[datetime]:
+        return _date_to_datetime(value)
+    
+    class Config:
+        use_enum_values = True
\ No newline at end of file
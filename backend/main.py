@@ -1,7 +1,10 @@
 import os
+import logging
 import uvicorn
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from app.profile.routes import router as profile_router
 from app.debts.routes import router as debts_router
 from app.scenarios.routes import router as scenarios_router
@@ -12,17 +15,41 @@ from app.config.routes import router as config_router
 from app.export.routes import router as export_router
 from app.analytics.routes import router as analytics_router
 from app.shared.database import Database
+from app.shared.ai_service import get_ai_service
+from app.analytics.service import get_analytics_service
+from app.config.reloader import CONFIG_WATCH_ENABLED, get_config_watcher
+from app.shared.llm_provider import LLMProviderFactory
 from contextlib import asynccontextmanager
 
+# Per-request access lines are costly under load; warnings and errors still log
+logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup: Connect to database
     await Database.connect_db()
+    # Start coalescing analytics event and milestone writes
+    analytics_service = get_analytics_service()
+    analytics_service.event_batcher.start(Database.get_database())
+    analytics_service.shown_writer.start(Database.get_database())
+    # Warm the AI service so the first request doesn't pay for client setup
+    try:
+        get_ai_service()
+    except Exception as e:
+        print(f"⚠ AI service not initialized at startup: {e}")
+    # Reload config files as they are edited
+    config_watcher = get_config_watcher()
+    if CONFIG_WATCH_ENABLED:
+        config_watcher.start()
     yield
-    # Shutdown: Close database connection
+    # Shutdown: Stop watching configs, flush pending analytics writes, then close connections
+    await config_watcher.stop()
+    await analytics_service.event_batcher.stop()
+    await analytics_service.shown_writer.stop()
+    await LLMProviderFactory.close()
     await Database.close_db()
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # Configure CORS
 allowed_origins_str = os.environ.get("ALLOWED_ORIGINS", "")
@@ -44,8 +71,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+# Compress larger responses (debt lists, JSON/CSV exports); small bodies aren't
+# worth the CPU, and Starlette leaves text/event-stream responses uncompressed
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Include routers
 app.include_router(profile_router)
 app.include_router(debts_router)
@@ -59,13 +91,15 @@ app.include_router(analytics_router)
 
 @app.get("/api/v1/health")
 def read_root():
-    return {"status": "ok"}
+    return {"status": "ok", "database": {"connected": Database.is_connected()}}
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 10000))
+    # loop="auto" picks uvloop (installed with uvicorn[standard]) when available
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=port,
+        loop="auto",
         reload=False
     )
\ No newline at end of file